@@ -3,8 +3,15 @@
 """Script to demonstrate some sign of life."""
 
 import argparse
+import contextlib
+import functools
+import io
+import os
+import sys
 
+from officium import parallel
 from officium.bringup import bringup_components, make_date, resolvers
+from officium.ordostore import OrdoStore
 from officium.parts import Antiphon, StructuredLookup, Versicle, VersicleResponse, Psalmody
 from officium.vespers import Vespers
 
@@ -43,6 +50,25 @@ def parse_args():
     parser.add_argument('--verbose', '-v', action='store_true')
     parser.add_argument('--titular-path', '-t')
     parser.add_argument('--hour')
+    parser.add_argument('--verify-tables', action='store_true',
+                        help="Check precompiled rubrical tables against the "
+                             "rules.")
+    parser.add_argument('--verify-year-types', action='store_true',
+                        help="Resolve every year in full, checking the "
+                             "results memoised by year type.")
+    parser.add_argument('--transfer-checkpoints',
+                        help="File in which to keep transfer checkpoints "
+                             "between runs.  This is only read, and not "
+                             "updated, when running in parallel.")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Number of processes across which to divide "
+                             "the dates, by year.")
+    parser.add_argument('--ordo-cache',
+                        help="Directory in which to keep compiled ordos "
+                             "between runs.")
+    parser.add_argument('--miss-cache', type=int, metavar='SIZE',
+                        help="Number of keys not found by lookups to "
+                             "remember, in the index and the language data.")
     parser.add_argument('generic_file')
     parser.add_argument('lang_data_file')
     parser.add_argument('date')
@@ -50,21 +76,30 @@ def parse_args():
     return parser.parse_args()
 
 
-def main():
-    options = parse_args()
-
+def setup(options):
+    ordo_store = OrdoStore(options.ordo_cache) if options.ordo_cache else None
     resolver, lang_data = bringup_components(options.generic_file,
                                              options.lang_data_file,
                                              options.rubrics,
-                                             options.titular_path)
+                                             options.titular_path,
+                                             ordo_store, options.miss_cache)
+
+    if options.verify_tables:
+        resolver.occurrence_table().verify = True
+        resolver.concurrence_table().verify = True
+    resolver.verify_year_types = options.verify_year_types
+
+    if (options.transfer_checkpoints and
+        os.path.exists(options.transfer_checkpoints)):
+        resolver.load_transfer_checkpoints(options.transfer_checkpoints)
+
+    return resolver, lang_data
 
-    current_date = make_date(options.date)
-    end_date = make_date(options.end_date or options.date)
-    resolver._resolve_transfer_cache = resolver.resolve_transfer(current_date, end_date + 1)
-    resolver._resolve_transfer_cache_base = current_date
 
-    while current_date <= end_date:
-        hours = resolver.offices(current_date).items()
+def format_day(options, end_date, lang_data, current_date, hours):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        hours = hours.items()
         if options.hour is not None:
             hours = ((name, offices) for (name, offices) in hours
                      if name == options.hour)
@@ -77,7 +112,32 @@ def main():
                     if isinstance(office, Vespers):
                         print("Concurring:", office._concurring)
             render(offices, lang_data if options.render else None)
-        current_date += 1
+    return out.getvalue()
+
+
+def main():
+    options = parse_args()
+
+    start_date = make_date(options.date)
+    end_date = make_date(options.end_date or options.date)
+
+    if options.jobs > 1:
+        days = parallel.offices_range(functools.partial(setup, options),
+                                      start_date, end_date,
+                                      functools.partial(format_day, options,
+                                                        end_date),
+                                      jobs=options.jobs)
+        for text in days:
+            sys.stdout.write(text)
+        return
+
+    resolver, lang_data = setup(options)
+    for (current_date, hours) in resolver.offices_range(start_date, end_date):
+        sys.stdout.write(format_day(options, end_date, lang_data,
+                                    current_date, hours))
+
+    if options.transfer_checkpoints:
+        resolver.save_transfer_checkpoints(options.transfer_checkpoints)
 
 
 if __name__ == '__main__':
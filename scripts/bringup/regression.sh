@@ -2,7 +2,7 @@
 
 set -ex
 
-if [ $# -lt 2 -or $# -gt 3]; then
+if [ $# -lt 2 -o $# -gt 3 ]; then
   echo >&2 "Usage: $0 divinum-officium-path calcalc-path [base_commit]"
   exit 1
 fi
@@ -29,12 +29,14 @@ gen_output() {
     scripts/bringup/mk-data.sh "${divinum_officium}" "${calcalc}" "${data}"
 
     # TODO: It would be nicer to split these into separate files.
-    PYTHONPATH=src scripts/bringup/bringup.py \
-      -r divino \
-      --render \
-      --verbose \
-      "${data}/divino/"{calendar,propers/latin}.yaml \
-      2022-11-27 2024-12-1 > "${output}/offices"
+    for rubrics in divino rubricarum; do
+      PYTHONPATH=src scripts/bringup/bringup.py \
+        -r ${rubrics} \
+        --render \
+        --verbose \
+        "${data}/${rubrics}/"{calendar,propers/latin}.yaml \
+        2022-11-27 2024-12-1 > "${output}/offices-${rubrics}"
+    done
   )
 }
 
@@ -48,5 +50,14 @@ gen_output "${tempdir}/base-src" "${tempdir}/output/base"
 # Generate the output from the current commit.
 gen_output "${PWD}" "${tempdir}/output/current"
 
+# Check that the current commit's transfer checkpoints and compiled ordos
+# survive being saved and loaded, using the data generated for it above.
+for rubrics in divino rubricarum; do
+  PYTHONPATH=src scripts/bringup/store-check.py \
+    -r ${rubrics} \
+    "${tempdir}/gen-output-data/${rubrics}/"{calendar,propers/latin}.yaml \
+    2023 2024
+done
+
 # Calculate the diff.
 diff -ur "${tempdir}/output/base" "${tempdir}/output/current"
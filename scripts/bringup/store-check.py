@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+"""Script to check that transfer checkpoints and compiled ordos survive being
+saved and loaded, and that corrupt files are ignored rather than trusted.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from officium.bringup import bringup_components, resolvers
+from officium.ordostore import OrdoStore
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rubrics', '-r', choices=resolvers.keys(),
+                        default='rubricarum')
+    parser.add_argument('generic_file')
+    parser.add_argument('lang_data_file')
+    parser.add_argument('start_year', type=int)
+    parser.add_argument('end_year', type=int)
+    return parser.parse_args()
+
+
+def office_ids(offices):
+    return [office.office_id for office in offices]
+
+
+def ordo_ids(block):
+    return [office_ids(offices) for offices in block]
+
+
+class Checker:
+    def __init__(self, options):
+        self.options = options
+        self.failures = 0
+
+    def resolver(self, ordo_store=None):
+        resolver, _ = bringup_components(self.options.generic_file,
+                                         self.options.lang_data_file,
+                                         self.options.rubrics, None,
+                                         ordo_store)
+        return resolver
+
+    def check(self, condition, description):
+        print("%s: %s" % ("ok" if condition else "FAILED", description))
+        if not condition:
+            self.failures += 1
+
+    def check_checkpoints(self, tempdir):
+        years = range(self.options.start_year, self.options.end_year + 1)
+        path = os.path.join(tempdir, 'checkpoints.json')
+
+        saving = self.resolver()
+        expected = {year: office_ids(saving.transfer_checkpoint(year).pending)
+                    for year in years}
+        saving.save_transfer_checkpoints(path)
+
+        loading = self.resolver()
+        self.check(loading.load_transfer_checkpoints(path),
+                   "checkpoints load")
+        self.check(all(office_ids(loading.transfer_checkpoint(year).pending) ==
+                       expected[year]
+                       for year in years),
+                   "checkpoints round trip")
+
+        with open(path, encoding='utf-8') as f:
+            saved = f.read()
+        corrupt = [
+            ('empty', ''),
+            ('truncated', saved[:len(saved) // 2]),
+            ('not an object', '[]'),
+            ('null', 'null'),
+            ('wrong fingerprint', saved.replace('"fingerprint": "',
+                                                '"fingerprint": "x')),
+            ('missing checkpoints', '{"fingerprint": "%s"}' %
+             (loading.calendar_fingerprint(),)),
+            # A year before any that was saved, so as not to be overridden.
+            ('unknown office', saved.replace(
+                '"checkpoints": {',
+                '"checkpoints": {"%d": [["%s", "nonexistent", 0]], ' %
+                (self.options.start_year - 50, type(loading).__name__), 1)),
+        ]
+        for (description, text) in corrupt:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.check(not self.resolver().load_transfer_checkpoints(path),
+                       "checkpoints ignored when %s" % (description,))
+
+    def check_ordo_store(self, tempdir):
+        store = OrdoStore(os.path.join(tempdir, 'ordo'))
+        year = self.options.start_year
+        writing = self.resolver(store)
+        expected = ordo_ids(writing.resolve_transfer_year(year))
+        rubrics = type(writing).__name__
+        fingerprint = writing.calendar_fingerprint()
+        path = store.path(rubrics, fingerprint, year)
+        self.check(store.read(rubrics, fingerprint, year) == expected,
+                   "ordo written")
+        self.check(ordo_ids(self.resolver(store).resolve_transfer_year(year)) ==
+                   expected,
+                   "ordo round trip")
+
+        with open(path, 'rb') as f:
+            saved = f.read()
+        corrupt = [
+            ('empty', b''),
+            ('truncated', saved[:len(saved) // 2]),
+            ('wrong magic', b'x' + saved[1:]),
+            ('bad header', saved[:len(OrdoStore.MAGIC) + 4] + b'!' +
+             saved[len(OrdoStore.MAGIC) + 5:]),
+            ('wrong version', saved.replace(b'"version": %d' %
+                                            (OrdoStore.VERSION,),
+                                            b'"version": 0')),
+        ]
+        for (description, data) in corrupt:
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.check(store.read(rubrics, fingerprint, year) is None,
+                       "ordo ignored when %s" % (description,))
+            self.check(
+                ordo_ids(self.resolver(store).resolve_transfer_year(year)) ==
+                expected and store.read(rubrics, fingerprint, year) == expected,
+                "ordo regenerated when %s" % (description,))
+
+        # Files that parse but no longer match the calendar.
+        stale = [
+            ('unknown office', [[(rubrics, 'nonexistent', 0)]] +
+             expected[1:]),
+            ('too few days', expected[:-1]),
+        ]
+        for (description, days) in stale:
+            store.write(rubrics, fingerprint, year, days)
+            self.check(
+                ordo_ids(self.resolver(store).resolve_transfer_year(year)) ==
+                expected and store.read(rubrics, fingerprint, year) == expected,
+                "ordo regenerated when %s" % (description,))
+
+
+def main():
+    options = parse_args()
+    checker = Checker(options)
+    with tempfile.TemporaryDirectory() as tempdir:
+        checker.check_checkpoints(tempdir)
+        checker.check_ordo_store(tempdir)
+    if checker.failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ import argparse
 
 from officium.bringup import bringup_components, make_date, resolvers
 from officium.calendar import Date
+from officium.ordostore import OrdoStore
 
 
 def parse_args():
@@ -16,6 +17,9 @@ def parse_args():
     parser.add_argument('--rubrics', '-r', choices=resolvers.keys(),
                         default='rubricarum')
     parser.add_argument('--verbose', '-v', action='store_true')
+    parser.add_argument('--ordo-cache',
+                        help="Directory in which to keep compiled ordos "
+                             "between runs.")
     parser.add_argument('generic_file')
     parser.add_argument('lang_data_file')
     parser.add_argument('year', type=int, help="Year to generate.")
@@ -24,23 +28,22 @@ def parse_args():
 
 def main():
     options = parse_args()
+    ordo_store = OrdoStore(options.ordo_cache) if options.ordo_cache else None
 
     resolver, lang_data = bringup_components(options.generic_file,
                                              options.lang_data_file,
                                              options.rubrics,
-                                             titular_path=None)
+                                             titular_path=None,
+                                             ordo_store=ordo_store)
 
     current_date = Date(options.year, 1, 1)
     end_date = Date(options.year, 12, 31)
-    resolver._resolve_transfer_cache = resolver.resolve_transfer(current_date, end_date + 1)
-    resolver._resolve_transfer_cache_base = current_date
 
     while current_date <= end_date:
         offices = resolver.offices(current_date)['lauds']
         natural_office = resolver.resolve_occurrence(current_date)[0]
         for office in offices:
-            # XXX: Hacky test for equality of offices.
-            if options.all or list(office._office.keys) != list(natural_office.keys):
+            if options.all or office._office != natural_office:
                 if options.verbose:
                     print("Date:", current_date)
                     print("Office:", office._office)
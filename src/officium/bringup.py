@@ -1,7 +1,10 @@
+from collections import ChainMap
+import itertools
+
 import yaml
 
 from officium.calendar import Date
-from officium.data import Data
+from officium.data import Data, KeyIndex
 from officium.divino.calendar import CalendarResolverDA
 from officium.rubricarum.calendar import CalendarResolver1962
 
@@ -29,8 +32,8 @@ def merge_records(data, records):
             assert False, record[0]
 
 
-def make_data(*base_dicts):
-    data = Data({})
+def make_data(*base_dicts, miss_cache_size=None):
+    data = Data({}, miss_cache_size=miss_cache_size)
     for d in base_dicts:
         data.create(d)
     return data
@@ -45,7 +48,7 @@ def make_generic(rubrics, raw_generic):
     return data
 
 
-def make_latin(raw_latin):
+def make_latin(raw_latin, miss_cache_size=None):
     latin = {
         'versiculi/deus-in-adjutorium': 'Deus, in adjutórium meum inténde.',
         'versiculi/domine-ad-adjuvandum': 'Dómine, ad adjuvándum me festína.',
@@ -61,27 +64,32 @@ def make_latin(raw_latin):
         ],
     }
 
-    data = make_data(latin)
+    data = make_data(latin, miss_cache_size=miss_cache_size)
     merge_records(data, raw_latin)
     return data
 
 
 # XXX: Latin is special here, but only because we're building the index, which
 # in principle should be external.
-def bringup_components(generic_file, latin_data_file, rubrics, titular_path):
+def bringup_components(generic_file, latin_data_file, rubrics, titular_path,
+                       ordo_store=None, miss_cache_size=None):
     with open(generic_file) as f:
         raw_generic = yaml.load(f, Loader=yaml.CSafeLoader)
     with open(latin_data_file) as f:
         raw_latin_data = yaml.load(f, Loader=yaml.CSafeLoader)
 
     data = make_generic(rubrics, raw_generic)
-    latin_data = make_latin(raw_latin_data)
-    index = make_data(data.dictionary, latin_data.dictionary)
-    for key in index.dictionary:
-        index.dictionary[key] = 'INDEX'
+    latin_data = make_latin(raw_latin_data, miss_cache_size)
     # XXX: Redirections shouldn't be in latin_data.
-    index.redirections = dict(data.redirections, **latin_data.redirections)
-
-    resolver = resolvers[rubrics](data, index, titular_path)
+    index = KeyIndex(
+        frozenset(itertools.chain(data.dictionary, latin_data.dictionary)),
+        ChainMap(latin_data.redirections, data.redirections),
+        miss_cache_size,
+    )
+    index.validate_redirections()
+
+    resolver = resolvers[rubrics](data, index, titular_path,
+                                  ordo_store=ordo_store)
+    resolver.compile_calendar()
 
     return resolver, latin_data
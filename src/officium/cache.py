@@ -0,0 +1,80 @@
+from collections import OrderedDict
+import sys
+
+
+class LRUCache:
+    """A bounded mapping that discards its least-recently-used entries once it
+    holds more than max_size of them.  Hit, miss and eviction counts are kept
+    for monitoring.  None cannot be stored, since get() uses it to signal a
+    miss.
+    """
+
+    def __init__(self, max_size):
+        assert max_size >= 0
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        assert value is not None
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def evict(self, key=None):
+        """Evicts the specified entry, or every entry if none is specified."""
+        if key is None:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+        elif self._entries.pop(key, None) is not None:
+            self.evictions += 1
+
+    def clear(self):
+        """Discards every entry without counting them as evictions, for when
+        their contents have become invalid rather than been crowded out.
+        """
+        self._entries.clear()
+
+    @property
+    def memory(self):
+        """Returns an estimate in bytes of the memory held by the cache itself
+        and by its keys.  Values are not counted, since they are usually
+        shared with the rest of the program.
+        """
+        return (sys.getsizeof(self._entries) +
+                sum(sys.getsizeof(key) for key in self._entries))
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    @property
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
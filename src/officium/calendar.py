@@ -1,32 +1,81 @@
 from abc import ABC, abstractmethod
+import bisect
 import calendar as stdlib_calendar
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import datetime
 import enum
+import functools
+import hashlib
 import itertools
+import json
 import re
 
 from . import offices
 from . import hours
+from .cache import LRUCache
+from .util import atomic_write
 
 
 BVM_SATURDAY_CALPOINT = 'SMariaeInSabbato'
 
 
-class Date(datetime.date):
-    # pylint: disable=unused-argument
-    def __init__(self, *args, **kwargs):
-        super().__init__()
-        self._day_of_week = self.isoweekday() % 7
+class Date:
+    """An immutable date in the proleptic Gregorian calendar.
 
-    def __add__(self, days):
-        base_result = super().__add__(datetime.timedelta(days=days))
-        return Date(base_result.year, base_result.month, base_result.day)
+    Dates are represented by their ordinal, as for datetime.date.toordinal(),
+    so that adding and subtracting days is integer arithmetic.  The calendar
+    fields are computed only when first needed.
+    """
+    __slots__ = ('_ordinal', '_day_of_week', '_ymd')
 
-    def __sub__(self, days_or_date):
-        if isinstance(days_or_date, self.__class__):
-            return super().__sub__(days_or_date).days
-        return self + (-days_or_date)
+    # The slots can be assigned only through object.__setattr__(), since
+    # Date forbids assignment.  Declare them so that pylint knows of them.
+    # _ymd is None until the calendar fields are first needed.
+    _ordinal: int
+    _day_of_week: int
+    _ymd: tuple
+
+    def __init__(self, year, month, day):
+        self._set(datetime.date(year, month, day).toordinal(),
+                  (year, month, day))
+
+    def _set(self, ordinal, ymd):
+        object.__setattr__(self, '_ordinal', ordinal)
+        # Ordinal one is a Monday, so this counts from Sunday at zero.
+        object.__setattr__(self, '_day_of_week', ordinal % 7)
+        object.__setattr__(self, '_ymd', ymd)
+
+    @classmethod
+    def fromordinal(cls, ordinal):
+        date = cls.__new__(cls)
+        date._set(ordinal, None)
+        return date
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is immutable" % (self.__class__.__name__,))
+
+    def __reduce__(self):
+        return (self.__class__.fromordinal, (self._ordinal,))
+
+    def _fields(self):
+        ymd = self._ymd
+        if ymd is None:
+            date = datetime.date.fromordinal(self._ordinal)
+            ymd = (date.year, date.month, date.day)
+            object.__setattr__(self, '_ymd', ymd)
+        return ymd
+
+    @property
+    def year(self):
+        return self._fields()[0]
+
+    @property
+    def month(self):
+        return self._fields()[1]
+
+    @property
+    def day(self):
+        return self._fields()[2]
 
     @property
     def day_of_week(self):
@@ -35,6 +84,69 @@ class Date(datetime.date):
         """
         return self._day_of_week
 
+    def toordinal(self):
+        return self._ordinal
+
+    def to_date(self):
+        return datetime.date.fromordinal(self._ordinal)
+
+    def weekday(self):
+        return (self._day_of_week + 6) % 7
+
+    def isoweekday(self):
+        return self._day_of_week or 7
+
+    def isoformat(self):
+        return '%04d-%02d-%02d' % self._fields()
+
+    def __str__(self):
+        return self.isoformat()
+
+    def __repr__(self):
+        return '%s(%d, %d, %d)' % ((self.__class__.__name__,) +
+                                   self._fields())
+
+    def __add__(self, days):
+        return self.fromordinal(self._ordinal + days)
+
+    def __sub__(self, days_or_date):
+        if isinstance(days_or_date, Date):
+            return self._ordinal - days_or_date._ordinal
+        return self.fromordinal(self._ordinal - days_or_date)
+
+    def __hash__(self):
+        return hash(self._ordinal)
+
+    def __eq__(self, other):
+        if isinstance(other, Date):
+            return self._ordinal == other._ordinal
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, Date):
+            return self._ordinal != other._ordinal
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Date):
+            return self._ordinal < other._ordinal
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Date):
+            return self._ordinal <= other._ordinal
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Date):
+            return self._ordinal > other._ordinal
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Date):
+            return self._ordinal >= other._ordinal
+        return NotImplemented
+
 
 class Resolution(enum.Enum):
     FROM_THE_CHAPTER = enum.auto()
@@ -44,19 +156,533 @@ class Resolution(enum.Enum):
     APPEND = enum.auto()
 
 
+class YearTable:
+    """The movable dates of a single year, computed once and shared by
+    everything that needs them.  Instances are obtained through
+    CalendarResolver.year_table() and should be treated as immutable.
+    """
+
+    def __init__(self, resolver_class, year):
+        self.year = year
+
+        self.epiphany = Date(year, 1, 6)
+        self.easter = resolver_class.easter_sunday(year)
+        self.septuagesima = self.easter - 9 * 7
+        self.lent1 = self.easter - 6 * 7
+        self.pentecost = self.easter + 7 * 7
+        self.pent22 = self.pentecost + 22 * 7
+        self.advent = resolver_class.advent_sunday(year)
+        self.christmas_eve = Date(year, 12, 24)
+
+        # The Sunday on which each reading-month from August to December
+        # begins, in order.  These depend on the resolver's notion of a
+        # well-behaved reading date.
+        self.reading_months = list(range(8, 13))
+        self.reading_month_starts = [
+            self._reading_month_start(resolver_class, month)
+            for month in self.reading_months
+        ]
+
+        # Every Sunday that begins a week in the temporal cycle, together with
+        # the name of that week.
+        self.temporal_sundays = []
+        self.temporal_weeks = []
+        sunday = self.epiphany - self.epiphany.day_of_week + 7
+        while sunday < self.christmas_eve:
+            self.temporal_sundays.append(sunday)
+            self.temporal_weeks.append(self._sunday_week(sunday))
+            sunday += 7
+
+    def _reading_month_start(self, resolver_class, month):
+        # Start from a Sunday that is certainly in the preceding reading-month
+        # and step forward until we reach the requested one.
+        first = Date(self.year, month, 1) - 7
+        sunday = first - first.day_of_week
+        while resolver_class.well_behaved_reading_date(sunday).month != month:
+            sunday += 7
+        return sunday
+
+    def _sunday_week(self, sunday):
+        # Sundays after Epiphany.
+        if sunday < self.septuagesima:
+            return "Epi%d" % ((sunday - self.epiphany + 6) // 7,)
+
+        # Septuagesima and Lent.
+        if sunday < self.lent1:
+            return "Quadp%d" % ((sunday - self.septuagesima) // 7 + 1,)
+        if sunday < self.easter:
+            return "Quad%d" % ((sunday - self.lent1) // 7 + 1,)
+
+        # Paschaltide.
+        if sunday <= self.pentecost:
+            return "Pasc%d" % ((sunday - self.easter) // 7,)
+
+        # Sundays after Pentecost, up to and including the twenty-second, after
+        # which things get complicated.
+        if sunday <= self.pent22:
+            return "Pent%02d" % ((sunday - self.pentecost) // 7,)
+
+        # The office of the twenty-fourth Sunday after Pentecost is always kept
+        # on the Sunday before Advent, even when there are only twenty-three
+        # Sundays after Pentecost.  Any Sundays after the twenty-third and
+        # before the last are filled with the Sundays remaining after Epiphany.
+        pent_last = self.advent - 7
+        if sunday < pent_last:
+            if sunday == self.pent22 + 7:
+                return "Pent23"
+            return "Epi%d" % (7 - (pent_last - sunday) // 7,)
+
+        # Last Sunday after Pentecost and Advent.
+        if sunday < self.advent:
+            assert sunday == pent_last
+            return "Pent24"
+        return "Adv%d" % ((sunday - self.advent) // 7 + 1,)
+
+    def reading_month(self, date):
+        """Returns a (month, first Sunday) pair for the reading-month
+        containing the specified date, or (None, None) if the date precedes
+        the August reading-month.
+        """
+        i = bisect.bisect_right(self.reading_month_starts, date) - 1
+        if i < 0:
+            return (None, None)
+        return (self.reading_months[i], self.reading_month_starts[i])
+
+    def temporal_week(self, date):
+        """Returns the name of the week in the temporal cycle containing the
+        specified date, or None between Christmas Eve and the first Sunday
+        after the Epiphany.
+        """
+        # From Christmas Eve, the day in the temporal cycle is determined by
+        # the calendar date.
+        if date >= self.christmas_eve:
+            return None
+
+        # Round down to Sunday.  The temporal cycle reanchors itself to Sundays
+        # on the first Sunday after Epiphany.
+        sunday = date - date.day_of_week
+        i = bisect.bisect_right(self.temporal_sundays, sunday) - 1
+        if i < 0:
+            return None
+        return self.temporal_weeks[i]
+
+
+class CalpointTable:
+    """An enumeration of calpoints for a set of rubrics.  Each calpoint has a
+    dense integer ID, so that the per-day code can work with calpoints
+    without building strings and parsing them back; names are needed only to
+    find calendar entries and for output.  The season, week, day and doxology
+    of each calpoint are worked out once, when it is enumerated.
+
+    IDs for everything that generate_calpoints() can produce are allocated up
+    front, arranged by the fields from which they're derived.  Any other
+    calpoint is allocated an ID when first interned.  Instances are obtained
+    through CalendarResolver.calpoint_table().
+    """
+
+    def __init__(self, resolver_class):
+        self._resolver_class = resolver_class
+        self._names = []
+        self._ids = {}
+        self._fields = []
+        self._doxologies = []
+
+        day_names = resolver_class.calpoint_day_names
+        months = range(1, 13)
+
+        # Indexed by month and day.
+        self.calendar_days = [None] + [
+            [None] + [self.intern('%02d-%02d' % (month, day))
+                      for day in range(1, 32)]
+            for month in months
+        ]
+
+        # Indexed by month, day of the week, and the week in the month.
+        self.weekdays_in_month = [None] + [
+            [
+                [None] + [self.intern('%02d-%s-%d' % (month, day_name, n))
+                          for n in range(1, 6)]
+                for day_name in day_names
+            ]
+            for month in months
+        ]
+
+        # Indexed by month.
+        self.last_sundays = [None] + [
+            self.intern('%02d-%s-Ult' % (month, day_names[0]))
+            for month in months
+        ]
+
+        # Indexed by reading-day triple.
+        self.reading_days = {
+            (month, week, day): self.intern('%02d%d-%d' % (month, week, day))
+            for month in range(8, 12)
+            for week in range(1, 6)
+            for day in range(7)
+        }
+
+        # Indexed by the name of the week, then by day of the week.
+        self.temporal_weeks = {}
+        for week in itertools.chain(
+            ('Adv%d' % (n,) for n in range(1, 5)),
+            ('Epi%d' % (n,) for n in range(1, 7)),
+            ('Quadp%d' % (n,) for n in range(1, 4)),
+            ('Quad%d' % (n,) for n in range(1, 7)),
+            ('Pasc%d' % (n,) for n in range(8)),
+            ('Pent%02d' % (n,) for n in range(1, 25)),
+        ):
+            self.temporal_week(week)
+
+        self.bvm_saturday = self.intern(BVM_SATURDAY_CALPOINT)
+
+    def __len__(self):
+        return len(self._names)
+
+    def intern(self, name):
+        """Returns the ID of the named calpoint, allocating one if necessary.
+        """
+        calpoint = self._ids.get(name)
+        if calpoint is None:
+            calpoint = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._fields.append(self._resolver_class.split_calpoint(name))
+            self._doxologies.append(
+                self._resolver_class.calpoint_doxology(name)
+            )
+        return calpoint
+
+    def temporal_week(self, week):
+        """Returns the IDs of the days in the named week of the temporal cycle,
+        indexed by day of the week.
+        """
+        ids = self.temporal_weeks.get(week)
+        if ids is None:
+            ids = self.temporal_weeks[week] = [
+                self.intern('%s-%d' % (week, day)) for day in range(7)
+            ]
+        return ids
+
+    def id(self, name):
+        """Returns the ID of the named calpoint, or None if it has none."""
+        return self._ids.get(name)
+
+    def name(self, calpoint):
+        return self._names[calpoint]
+
+    def fields(self, calpoint):
+        """Returns the (season, week, day) of a calpoint in the temporal cycle,
+        or (None, None, None) for any other calpoint.
+        """
+        return self._fields[calpoint]
+
+    def season(self, calpoint):
+        return self._fields[calpoint][0]
+
+    def doxology(self, calpoint):
+        return self._doxologies[calpoint]
+
+
+class TransferSession:
+    """Resolves occurrence and transfer one day at a time, carrying the queue
+    of offices awaiting transfer forward from each day to the next.  Iterating
+    over a session yields (date, offices) pairs in date order, without end, so
+    that walking any number of days costs one resolution of occurrence per
+    day.
+
+    Sessions are normally obtained from CalendarResolver.transfer_session().
+    The state of the queue when the session begins must be supplied by the
+    caller: it is empty by default, which is appropriate when starting from a
+    Sunday far enough in the past that nothing pending could survive to the
+    dates of interest.
+    """
+
+    # Number of days for which calpoints are generated in one batch.
+    CALPOINT_BLOCK_DAYS = 28
+
+    def __init__(self, resolver, start, pending=()):
+        self._resolver = resolver
+        self._date = start
+        self._transfer = deque(pending)
+        self._calpoints = deque()
+
+    def __iter__(self):
+        return self
+
+    @property
+    def date(self):
+        """The date that will be resolved next."""
+        return self._date
+
+    @property
+    def pending_transfers(self):
+        """The offices awaiting transfer before the next date is resolved,
+        in the order in which they will be placed.
+        """
+        return tuple(self._transfer)
+
+    def __next__(self):
+        resolver = self._resolver
+        transfer = self._transfer
+
+        if not self._calpoints:
+            self._calpoints.extend(resolver.generate_calpoints_range(
+                self._date, self._date + self.CALPOINT_BLOCK_DAYS - 1))
+        offices = resolver.resolve_calpoint_occurrence(
+            self._calpoints.popleft())
+
+        # TODO: Implement the resumption and anticipation of Sundays.
+        if transfer and resolver.can_transfer(transfer[0], offices):
+            offices = [transfer.popleft()] + offices
+
+        # If any tail offices should be transferred, add them to the transfer
+        # queue.
+        new_transfers = [
+            x for x in offices[1:]
+            if (resolver.resolve_occurrence_pair(offices[0], x)[1] ==
+                Resolution.TRANSLATE)
+        ]
+        transfer.extend(new_transfers)
+
+        # Remove any offices that have been transferred away from this day,
+        # and also any that are omitted in occurrence with the winner.
+        transferred = set(new_transfers)
+        offices = [offices[0]] + [x for x in offices[1:]
+                                  if x not in transferred]
+
+        # Note that at this point we do _not_ filter out any offices that will
+        # be omitted in occurrence.  This is because this is not well-defined
+        # until we fix the hour: for example, a feria can reappear at Vespers
+        # after having been omitted during the office of an occurring simple
+        # feast.
+
+        date = self._date
+        self._date = date + 1
+        return (date, offices)
+
+
+class TransferWalk:
+    """A TransferSession kept by the resolver between requests, together with
+    the days that it has resolved in its current year, so that a request for
+    later days continues it rather than starting afresh.
+    """
+
+    def __init__(self, session, checkpoint_year, cold=False):
+        self.session = session
+        # The date from which the session started with nothing awaiting
+        # transfer, or None if it started from a checkpoint.
+        self.origin = session.date if cold else None
+        # The year whose checkpoint the session will reach next, and the year
+        # of the first checkpoint that it recorded.  From there on, its state
+        # is that of resolution from the usual warm-up.
+        self.checkpoint_year = checkpoint_year
+        self.settled_year = None
+        # The offices for each day that the session has resolved in its
+        # current year, starting from first, and whether these will make up
+        # the whole year.
+        self.first = session.date
+        self.days = []
+        self.whole_year = False
+
+
+class ResolutionTable:
+    """A table of the results of a set of rules that decide between a pair of
+    offices, indexed by the rubrical signatures of the offices and filled in
+    as pairs are met.  The rules are thus run once per combination of kinds
+    of office, rather than once per comparison.  Subclasses say what else the
+    rules depend on by overriding key().
+
+    In verification mode, the rules are run for every lookup and an
+    AssertionError is raised if they disagree with the table.
+    """
+
+    def __init__(self, rules, verify=False):
+        self._rules = rules
+        self._table = {}
+        self.verify = verify
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def key(self, a, b, *args):
+        return (a.rubrical_signature, b.rubrical_signature)
+
+    def _run_rules(self, a, b, *args):
+        winner, resolution = self._rules(a, b, *args)
+        assert winner is a or winner is b, (a, b, winner)
+        return (winner is b, resolution)
+
+    def resolve(self, a, b, *args):
+        key = self.key(a, b, *args)
+        entry = self._table.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._table[key] = self._run_rules(a, b, *args)
+        else:
+            self.hits += 1
+            if self.verify:
+                actual = self._run_rules(a, b, *args)
+                assert actual == entry, (
+                    "%s disagrees with rules for %r, %r: %r != %r" % (
+                        self.__class__.__name__, a, b, entry, actual)
+                )
+        b_wins, resolution = entry
+        return (b if b_wins else a, resolution)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    @property
+    def stats(self):
+        return {
+            'size': len(self._table),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+class OccurrenceTable(ResolutionTable):
+    """Resolution table for the rules of occurrence, which depend on nothing
+    but the two offices.
+    """
+
+
+class ConcurrenceTable(ResolutionTable):
+    """Resolution table for the rules of concurrence.  These may also depend on
+    the date, but only through the resolver's concurrence_date_key(), and on
+    whether the two offices belong to the same octave.
+    """
+
+    def __init__(self, rules, date_key, verify=False):
+        super().__init__(rules, verify)
+        self._date_key = date_key
+
+    def key(self, a, b, *args):
+        date, = args
+        return super().key(a, b) + (a.octave_id == b.octave_id,
+                                    self._date_key(date))
+
+
+class TransferCheckpoint:
+    """The state of transfer resolution at the start of a year: the date of
+    the checkpoint and the offices then awaiting transfer.  Resuming a
+    TransferSession from a checkpoint gives the same results as resolving from
+    the usual warm-up point a year earlier.
+    """
+
+    def __init__(self, date, pending):
+        self.date = date
+        self.pending = tuple(pending)
+
+
+class TransferCache(LRUCache):
+    """A bounded least-recently-used cache of days resolved for transfer,
+    held in blocks of one calendar year.
+    """
+
+
+class DayPlan:
+    """The arrangement of Lauds and Vespers on a day, independent of the date
+    itself: the hour class and office for each, together with everything else
+    from which the hours are constructed.
+    """
+
+    def __init__(self, seasons, season_keys, doxology, lauds,
+                 lauds_commemorations, vespers, morning_offices, concurring,
+                 vespers_commemorations):
+        self.seasons = tuple(seasons)
+        self.season_keys = tuple(season_keys)
+        self.doxology = doxology
+        self.lauds = tuple(lauds)
+        self.lauds_commemorations = tuple(lauds_commemorations)
+        self.vespers = tuple(vespers)
+        self.morning_offices = tuple(morning_offices)
+        self.concurring = tuple(concurring)
+        self.vespers_commemorations = tuple(vespers_commemorations)
+
+
 class CalendarResolver(ABC):
     # Latest date in January on which Nat2-0 can fall.  This value is correct
     # for most versions, but can be overridden in others.
     NAT2_SUNDAY_LIMIT = 4
 
-    def __init__(self, data_map, index, titular_path=None):
+    # Version of the resolution rules, included in the calendar fingerprint so
+    # that persisted transfer state is discarded when they change.  This must
+    # be bumped whenever a change to the resolver or to the offices alters the
+    # result of resolving any day, in this class or in a subclass.
+    RULES_VERSION = 1
+
+    # Number of years of resolved days to keep in the transfer cache.
+    TRANSFER_CACHE_YEARS = 8
+
+    # Number of distinct combinations of calpoints for which to remember the
+    # resolution of occurrence.
+    OCCURRENCE_MEMO_SIZE = 16384
+
+    # Number of distinct day signatures for which to remember the arrangement
+    # of the hours.
+    DAY_PLAN_MEMO_SIZE = 4096
+
+    def __init__(self, data_map, index, titular_path=None,
+                 transfer_cache_years=None, ordo_store=None):
         self._data_map = data_map
         self._index = index
         self._titular_path = titular_path
+        self._ordo_store = ordo_store
+        self._transfer_cache = TransferCache(
+            self.TRANSFER_CACHE_YEARS if transfer_cache_years is None else
+            transfer_cache_years
+        )
+        self._transfer_checkpoints = {}
+        self._transfer_walk = None
+
+        # Transfer resolution memoised by year type: the offices awaiting
+        # transfer at the checkpoint for the following year, by the type of
+        # the year; and each year's resolved days, by the type of the year and
+        # the offices awaiting transfer at its checkpoint.  Both are bounded by
+        # the number of year types.  If verify_year_types is set, each year is
+        # nonetheless resolved in full and checked against the memos, and
+        # AssertionError is raised if they disagree.
+        self._year_type_checkpoints = {}
+        self._year_type_blocks = {}
+        self.verify_year_types = False
+
+        self._occurrence_memo = LRUCache(self.OCCURRENCE_MEMO_SIZE)
+        self._day_plan_memo = LRUCache(self.DAY_PLAN_MEMO_SIZE)
+        self._calendar_fingerprint = None
+
+        # Interning table of the offices for each calpoint.  Once the calendar
+        # has been compiled, this is complete.
+        self._calpoint_offices = {}
+        self._calendar_compiled = False
 
-        # XXX: Temporary crude cache to make regression tests faster.
-        self._resolve_transfer_cache = None
-        self._resolve_transfer_cache_base = None
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def year_table(cls, year):
+        """Returns the YearTable for the specified year.  These are cached, so
+        callers should use this in preference to recomputing movable dates.
+        """
+        return YearTable(cls, year)
+
+    @classmethod
+    def year_type(cls, year):
+        """Returns a key identifying the type of the specified year.  Years of
+        the same type have the same calendar, day for day, since all movable
+        dates are determined by the date of Easter and the days of the week on
+        which the fixed dates fall.
+        """
+        easter = cls.easter_sunday(year)
+        return (easter.month, easter.day, Date(year, 1, 1).day_of_week,
+                stdlib_calendar.isleap(year))
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def calpoint_table(cls):
+        """Returns the CalpointTable for this set of rubrics."""
+        return CalpointTable(cls)
 
     @staticmethod
     def advent_sunday(year):
@@ -120,7 +746,7 @@ class CalendarResolver(ABC):
         return Date(year, month, day)
 
     @classmethod
-    def _well_behaved_reading_date(cls, date):
+    def well_behaved_reading_date(cls, date):
         """Returns a date in the same reading week as the specified date, but
         with the properties that its calendar month is equal to its reading
         month, and that its calendar month-week is equal to its reading
@@ -136,22 +762,24 @@ class CalendarResolver(ABC):
         day" for Matins for the specified date (e.g. (8, 4, 2) for the Tuesday
         in the fourth week of August) or None when this does not apply.
         """
-        # Find a well-behaved day for the current week, whose reading-month is
-        # its calendar-month.
-        well_behaved = cls._well_behaved_reading_date(date)
-        month = well_behaved.month
+        table = cls.year_table(date.year)
+
+        # Find the reading-month containing the date.  Reading-months begin on
+        # the Sunday of the week whose well-behaved day (whose reading-month
+        # is its calendar-month) first falls in the calendar month.
+        month, month_start = table.reading_month(date)
 
         # The reading months are August to November inclusive.
         if month not in range(8, 12):
             return None
-        advent = cls.advent_sunday(date.year)
+        advent = table.advent
         if date >= advent:
             return None
 
         # Find the (one-based) index of the week within the reading month.  By
         # well-behavedness, this is equal to to the week within the calendar
         # month.
-        week = (well_behaved.day - 1) // 7 + 1
+        week = (date - month_start) // 7 + 1
 
         # Special handling for November: the second week vanishes most years
         # (and always with the 1962 rubrics, owing to the later earliest
@@ -169,63 +797,7 @@ class CalendarResolver(ABC):
 
     @classmethod
     def temporal_week(cls, date):
-        # Round down to Sunday.
-        sunday = date - date.day_of_week
-
-        # The temporal cycle reanchors itself to Sundays on the first Sunday
-        # after Epiphany.
-        epiphany = Date(date.year, 1, 6)
-        if sunday <= epiphany:
-            return None
-
-        easter = cls.easter_sunday(date.year)
-        septuagesima = easter - 9 * 7
-
-        # Sundays after Epiphany.
-        if sunday < septuagesima:
-            return "Epi%d" % ((sunday - epiphany + 6) // 7,)
-
-        # Septuagesima and Lent.
-        lent1 = easter - 6 * 7
-        if sunday < lent1:
-            return "Quadp%d" % ((sunday - septuagesima) // 7 + 1,)
-        if sunday < easter:
-            return "Quad%d" % ((sunday - lent1) // 7 + 1,)
-
-        # Paschaltide.
-        pentecost = easter + 7 * 7
-        if sunday <= pentecost:
-            return "Pasc%d" % ((sunday - easter) // 7,)
-
-        # Sundays after Pentecost, up to and including the twenty-second, after
-        # which things get complicated.
-        pent22 = pentecost + 22 * 7
-        if sunday <= pent22:
-            return "Pent%02d" % ((sunday - pentecost) // 7,)
-
-        advent = cls.advent_sunday(date.year)
-
-        # The office of the twenty-fourth Sunday after Pentecost is always kept
-        # on the Sunday before Advent, even when there are only twenty-three
-        # Sundays after Pentecost.  Any Sundays after the twenty-third and
-        # before the last are filled with the Sundays remaining after Epiphany.
-        pent_last = advent - 7
-        if sunday < pent_last:
-            if sunday == pent22 + 7:
-                return "Pent23"
-            return "Epi%d" % (7 - (pent_last - sunday) // 7,)
-
-        # Last Sunday after Pentecost and Advent.  From Christmas Eve, the
-        # day in the temporal cycle is determined by the calendar date.
-        christmas_eve = Date(date.year, 12, 24)
-        if date < christmas_eve:
-            if sunday < advent:
-                assert sunday == pent_last
-                return "Pent24"
-            else:
-                return "Adv%d" % ((sunday - advent) // 7 + 1,)
-        else:
-            return None
+        return cls.year_table(date.year).temporal_week(date)
 
     @classmethod
     def temporal_calpoint(cls, date):
@@ -234,58 +806,149 @@ class CalendarResolver(ABC):
             return "%s-%d" % (week, date._day_of_week)
         return None
 
-    def generate_calpoints(self, date):
-        days = [
-            'Dominica',
-            'FeriaII',
-            'FeriaIII',
-            'FeriaIV',
-            'FeriaV',
-            'FeriaVI',
-            'Sabbato',
-        ]
+    @classmethod
+    def temporal_calpoint_id(cls, date):
+        week = cls.temporal_week(date)
+        if week:
+            return cls.calpoint_table().temporal_week(week)[date.day_of_week]
+        return None
 
-        month_prefix = '%02d-' % (date.month,)
-        days_in_month = stdlib_calendar.monthrange(date.year, date.month)[1]
+    calpoint_day_names = [
+        'Dominica',
+        'FeriaII',
+        'FeriaIII',
+        'FeriaIV',
+        'FeriaV',
+        'FeriaVI',
+        'Sabbato',
+    ]
+
+    @classmethod
+    def _calpoint_ids(cls, month, day, day_of_week, days_in_month, reading_day,
+                      temporal_week, christmas_calpoint):
+        """Finds the calpoint IDs for a day from its integer fields and its
+        already-resolved reading-day and temporal week.
+        """
+        table = cls.calpoint_table()
 
         calpoints = [
             # Calendar day: mm-dd.
-            month_prefix + '%02d' % (date.day,),
+            table.calendar_days[month][day],
 
             # nth x-day _in_ the month.
-            '%s%s-%d' % (
-                month_prefix,
-                days[date.day_of_week],
-                date.day // 7 + 1,
-            ),
+            table.weekdays_in_month[month][day_of_week][day // 7 + 1],
         ]
 
         # nth x-day _of_ the month.
-        reading_day = self.reading_day_str(date)
         if reading_day is not None:
-            calpoints.append(reading_day)
+            calpoint = table.reading_days.get(reading_day)
+            if calpoint is None:
+                calpoint = table.intern('%02d%d-%d' % reading_day)
+            calpoints.append(calpoint)
 
         # Last x-day.
-        if date.day_of_week == 0 and days_in_month - date.day < 7:
-            calpoints.append('%s%s-Ult' % (month_prefix,
-                                           days[date.day_of_week]))
+        if day_of_week == 0 and days_in_month - day < 7:
+            calpoints.append(table.last_sundays[month])
 
         # Temporal cycle, except for Christmas-Epiphany.
-        calpoint = self.temporal_calpoint(date)
-        if calpoint is not None:
-            calpoints.append(calpoint)
+        if temporal_week is not None:
+            calpoints.append(table.temporal_week(temporal_week)[day_of_week])
 
             # Office of our Lady on Saturday.
-            if date.day_of_week == 6:
-                calpoints.append(BVM_SATURDAY_CALPOINT)
-        else:
-            if self.is_sunday_in_christmas_octave(date):
-                calpoints.append('Nat1-0')
-            elif self.is_sunday_after_christmas_octave(date):
-                calpoints.append('Nat2-0')
+            if day_of_week == 6:
+                calpoints.append(table.bvm_saturday)
+        elif christmas_calpoint is not None:
+            calpoints.append(table.intern(christmas_calpoint))
 
         return calpoints
 
+    @classmethod
+    def christmas_calpoint(cls, date):
+        """Returns the calpoint for the Sundays in and after the octave of
+        Christmas, when the specified date is such a Sunday.
+        """
+        if cls.is_sunday_in_christmas_octave(date):
+            return 'Nat1-0'
+        if cls.is_sunday_after_christmas_octave(date):
+            return 'Nat2-0'
+        return None
+
+    def generate_calpoint_ids(self, date):
+        """Returns the IDs in the calpoint table of the calpoints for the
+        specified date.
+        """
+        temporal_week = self.temporal_week(date)
+        return self._calpoint_ids(
+            date.month,
+            date.day,
+            date.day_of_week,
+            stdlib_calendar.monthrange(date.year, date.month)[1],
+            self.reading_day(date),
+            temporal_week,
+            self.christmas_calpoint(date) if temporal_week is None else None,
+        )
+
+    def generate_calpoints(self, date):
+        table = self.calpoint_table()
+        return [table.name(calpoint)
+                for calpoint in self.generate_calpoint_ids(date)]
+
+    def generate_calpoints_range(self, start, end):
+        """Returns a list of the calpoint IDs for every day from start to end
+        inclusive, equivalent to calling generate_calpoint_ids() for each day.
+
+        The reading-day and the temporal week are constant across each week
+        beginning on a Sunday, so these are resolved once per week and the
+        remaining per-day work is integer arithmetic and table lookups.
+        """
+        assert start <= end
+        result = []
+
+        year, month, day = start.year, start.month, start.day
+        day_of_week = start.day_of_week
+        days_in_month = stdlib_calendar.monthrange(year, month)[1]
+        week_year = reading_week = temporal_week = None
+
+        for _ in range(end - start + 1):
+            if week_year is None or day_of_week == 0:
+                sunday = Date(year, month, day) - day_of_week
+                week_year = sunday.year
+                reading_week = self.reading_day(sunday)
+                temporal_week = self.temporal_week(sunday)
+
+            reading_day = (reading_week[:2] + (day_of_week,)
+                           if reading_week is not None else None)
+
+            # From Christmas Eve until the reanchoring of the temporal cycle,
+            # the calendar date takes over.
+            if year != week_year or (month == 12 and day >= 24):
+                day_temporal_week = None
+            else:
+                day_temporal_week = temporal_week
+
+            christmas_calpoint = None
+            if day_temporal_week is None and (month == 12 or month == 1):
+                christmas_calpoint = self.christmas_calpoint(Date(year, month,
+                                                                  day))
+
+            result.append(self._calpoint_ids(month, day, day_of_week,
+                                             days_in_month, reading_day,
+                                             day_temporal_week,
+                                             christmas_calpoint))
+
+            # Advance to the next day.
+            day_of_week = (day_of_week + 1) % 7
+            day += 1
+            if day > days_in_month:
+                day = 1
+                month += 1
+                if month > 12:
+                    month = 1
+                    year += 1
+                days_in_month = stdlib_calendar.monthrange(year, month)[1]
+
+        return result
+
     @classmethod
     def season(cls, calpoint_season, week, day):
         if calpoint_season == 'Quadp':
@@ -297,6 +960,7 @@ class CalendarResolver(ABC):
         return calpoint_season.lower()
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def split_calpoint(cls, calpoint):
         # TODO: Use named groups here.
         m = re.match(r'(Pent|Adv|Nat|Epi|Quadp|Quad|Pasc)(\d+)-([0-6])$',
@@ -314,13 +978,14 @@ class CalendarResolver(ABC):
         # We are intentionally lax in this regex to allow bringup scripts to
         # abuse this function by passing in a key rather than a calpoint.
         doxology = None
-        m = re.search(r'Pasc\d-\d', calpoint)
+        m = re.search(r'Pasc(\d)-(\d)', calpoint)
         if m:
-            if 'Pasc1-0' <= m.group(0) <= 'Pasc5-3':
+            week_day = (int(m.group(1)), int(m.group(2)))
+            if (1, 0) <= week_day <= (5, 3):
                 doxology = 'paschalis'
-            elif 'Pasc5-4' <= m.group(0) <= 'Pasc6-6':
+            elif (5, 4) <= week_day <= (6, 6):
                 doxology = 'ascensionis'
-            elif 'Pasc7-0' <= m.group(0) <= 'Pasc7-6':
+            elif (7, 0) <= week_day <= (7, 6):
                 doxology = 'pentecostes'
         return cls.doxology_path(doxology) if doxology else None
 
@@ -413,18 +1078,46 @@ class CalendarResolver(ABC):
         pass
 
     def calpoint_offices(self, calpoint):
+        """Returns the offices for the calpoint with the specified ID.  These
+        are built only once, so each calendar entry always yields the same
+        instance.
+        """
+        office_list = self._calpoint_offices.get(calpoint)
+        if office_list is None:
+            if self._calendar_compiled:
+                return []
+            office_list = self._calpoint_offices[calpoint] = tuple(
+                self._build_calpoint_offices(
+                    self.calpoint_table().name(calpoint)
+                )
+            )
+        return list(office_list)
+
+    def compile_calendar(self):
+        """Builds the offices for every entry in the calendar, with all
+        implicit and derived fields filled in, so that no descriptor need be
+        processed afterwards.  The calendar data must not change once this
+        has been called.
+        """
+        prefix = 'calendarium/'
+        table = self.calpoint_table()
+        for key in self._data_map.dictionary:
+            if key.startswith(prefix):
+                self.calpoint_offices(table.intern(key[len(prefix):]))
+        self._calendar_compiled = True
+
+    def _build_calpoint_offices(self, calpoint):
         calentry = 'calendarium/%s' % (calpoint,)
         default_desc = self.default_descriptor(calpoint)
         descriptors = self._data_map.get(calentry, [])
-        office_list = []
-        for descriptor in descriptors:
-            if default_desc is not None:
-                descriptor = dict(default_desc, **descriptor)
+        for (index, descriptor) in enumerate(descriptors):
+            # Always work on a copy, so that filling in implicit fields doesn't
+            # modify the calendar data.
+            descriptor = dict(default_desc or {}, **descriptor)
             desc_class = self.descriptor_class(descriptor)
             self.fill_implicit_descriptor_fields(desc_class, descriptor)
-            office = desc_class(descriptor)
-            office_list.append(office)
-        return office_list
+            yield desc_class(descriptor,
+                             (self.__class__.__name__, calpoint, index))
 
     @staticmethod
     @abstractmethod
@@ -432,23 +1125,130 @@ class CalendarResolver(ABC):
         # Override this method.
         raise NotImplementedError()
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def occurrence_table(cls):
+        """Returns the OccurrenceTable for this set of rubrics."""
+        return OccurrenceTable(cls.occurrence_resolution)
+
+    @classmethod
+    def resolve_occurrence_pair(cls, a, b):
+        """Equivalent to occurrence_resolution(), but served from the
+        occurrence table.  Callers should prefer this.
+        """
+        return cls.occurrence_table().resolve(a, b)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def concurrence_table(cls):
+        """Returns the ConcurrenceTable for this set of rubrics."""
+        return ConcurrenceTable(cls.concurrence_resolution,
+                                cls.concurrence_date_key)
+
+    @staticmethod
+    def concurrence_date_key(date):
+        """Returns as much of the date as concurrence_resolution() depends on.
+        By default this is the whole date; override it where the rules need
+        less, so that the concurrence table can be shared between days.
+        """
+        return date
+
+    @staticmethod
+    def day_plan_date_key(date):
+        """Returns as much of the date as the arrangement of the hours depends
+        on through the rubrical predicates that take a date, such as
+        has_first_vespers() and vespers_commem_filter().  By default this is
+        the whole date, which defeats the memoisation of day plans; override
+        it where the rules need less.
+        """
+        return date
+
+    @classmethod
+    def resolve_concurrence_pair(cls, preceding, following, date):
+        """Equivalent to concurrence_resolution(), but served from the
+        concurrence table.  Callers should prefer this.
+        """
+        return cls.concurrence_table().resolve(preceding, following, date)
+
     def resolve_occurrence(self, date):
-        calpoints = self.generate_calpoints(date)
-        offices = itertools.chain.from_iterable(self.calpoint_offices(c)
-                                                for c in calpoints)
+        return self.resolve_calpoint_occurrence(
+            self.generate_calpoint_ids(date)
+        )
+
+    @property
+    def occurrence_memo(self):
+        return self._occurrence_memo
+
+    @property
+    def day_plan_memo(self):
+        return self._day_plan_memo
+
+    def resolve_calpoint_occurrence(self, calpoints):
+        """Returns the offices occurring on a day with the specified calpoints,
+        sorted by precedence.  Occurrence depends only on the calpoints, so
+        the result is memoised on them.
+        """
+        key = tuple(calpoints)
+        ordered = self._occurrence_memo.get(key)
+        if ordered is None:
+            ordered = tuple(self._sort_occurring(key))
+            self._occurrence_memo.put(key, ordered)
+        return list(ordered)
+
+    @classmethod
+    def precedence_keys(cls, offices):
+        """Returns a sort key for each of the specified offices, or None.  The
+        keys must be such that, wherever two offices' keys differ, the office
+        with the smaller key wins in occurrence.  Only offices with equal keys
+        need then be compared pairwise.  Return None if the offices can't be
+        keyed in this way, in which case every pair might be compared.
+        """
+        return None
+
+    def _sort_occurring(self, calpoints):
+        offices = list(itertools.chain.from_iterable(self.calpoint_offices(c)
+                                                     for c in calpoints))
+        assert offices, calpoints
+
+        keys = self.precedence_keys(offices)
+        if keys is None:
+            return self._sort_pairwise(offices)
+
+        if self.occurrence_table().verify:
+            self._verify_precedence_keys(offices, keys)
+
+        # Sort on the keys, and then resolve ties, if any, pairwise.
+        ordered = []
+        keyed = sorted(zip(keys, range(len(offices))))
+        for (_, group) in itertools.groupby(keyed, key=lambda x: x[0]):
+            tied = [offices[i] for (_, i) in group]
+            ordered += self._sort_pairwise(tied) if len(tied) > 1 else tied
+        return ordered
+
+    def _sort_pairwise(self, offices):
         resolver = self
         class OccurrenceOrderer:
             def __init__(self, office):
                 self.office = office
 
             def __lt__(self, other):
-                resolution = resolver.occurrence_resolution(self.office,
-                                                            other.office)
+                resolution = resolver.resolve_occurrence_pair(self.office,
+                                                              other.office)
                 return resolution[0] is self.office
 
-        ordered = list(sorted(offices, key=OccurrenceOrderer))
-        assert ordered, calpoints
-        return ordered
+        return list(sorted(offices, key=OccurrenceOrderer))
+
+    def _verify_precedence_keys(self, offices, keys):
+        for ((a, a_key), (b, b_key)) in itertools.combinations(
+            zip(offices, keys), 2
+        ):
+            if a_key != b_key:
+                winner, _ = self.resolve_occurrence_pair(a, b)
+                expected = a if a_key < b_key else b
+                assert winner is expected, (
+                    "Precedence keys disagree with rules for %r (%r), "
+                    "%r (%r)" % (a, a_key, b, b_key)
+                )
 
     def resolve_commemorations(self, occurring, concurring=[]):
         # XXX: Support generators?  And sort!
@@ -509,58 +1309,288 @@ class CalendarResolver(ABC):
         # Override this method.
         raise NotImplementedError()
 
-    def resolve_transfer(self, start, end):
-        assert start <= end
+    def transfer_session(self, start, pending=()):
+        """Returns a TransferSession resolving days from the specified date
+        onwards, with the specified offices awaiting transfer.
+        """
+        return TransferSession(self, start, pending)
 
-        # XXX: Temporary external caching mechanism.
-        if self._resolve_transfer_cache_base is not None:
-            start_delta = start - self._resolve_transfer_cache_base
-            end_delta = end - self._resolve_transfer_cache_base
-            if (start_delta >= 0 and
-                end_delta - start_delta < len(self._resolve_transfer_cache)):
-                return [list(x) for x in self._resolve_transfer_cache[start_delta:end_delta + 1]]
-
-        # Offices can be transferred by up to a year, so start from a year ago.
-        current = start - 366
-        transfer = []
-        result = []
+    @property
+    def transfer_cache(self):
+        return self._transfer_cache
 
-        # Round down to a Sunday.  TODO: Implement the resumption and
-        # anticipation of Sundays.
-        while current.day_of_week != 0:
-            current -= 1
-        while current <= end:
-            offices = self.resolve_occurrence(current)
-            if transfer and self.can_transfer(transfer[0], offices):
-                offices = [transfer[0]] + offices
-                transfer = transfer[1:]
-
-            # If any tail offices should be transferred, add them to the
-            # transfer list.
-            def versus_other(other):
-                _, resolution = self.occurrence_resolution(offices[0], other)
-                return resolution
-            new_transfers = [x for x in offices[1:]
-                             if versus_other(x) == Resolution.TRANSLATE]
-            if new_transfers:
-                transfer += new_transfers
-
-            # Remove any offices that have been transferred away from this day,
-            # and also any that are omitted in occurrence with the winner.
-            offices = [offices[0]] + [x for x in offices[1:]
-                                      if x not in new_transfers]
-
-            # Note that at this point we do _not_ filter out any offices that
-            # will be omitted in occurrence.  This is because this is not
-            # well-defined until we fix the hour: for example, a feria can
-            # reappear at Vespers after having been omitted during the office
-            # of an occurring simple feast.
-
-            if current >= start:
-                result.append(offices)
-            current += 1
+    @staticmethod
+    def transfer_checkpoint_date(year):
+        """Returns the date of the checkpoint for the specified year, which is
+        the Sunday on which the week containing 01 Jan begins.
+        """
+        first = Date(year, 1, 1)
+        return first - first.day_of_week
 
-        return result
+    def transfer_checkpoint(self, year):
+        """Returns the TransferCheckpoint for the specified year, computing it
+        if it is not already known.
+        """
+        checkpoint = self._known_transfer_checkpoint(year)
+        if checkpoint is None:
+            # Warm up to the checkpoint, which the walk records as it passes.
+            walk = self._cold_transfer_walk(Date(year, 1, 1))
+            self._transfer_walk = walk
+            self._advance_transfer_walk(walk,
+                                        self.transfer_checkpoint_date(year))
+            checkpoint = self._transfer_checkpoints[year]
+        return checkpoint
+
+    def _known_transfer_checkpoint(self, year):
+        checkpoint = self._transfer_checkpoints.get(year)
+        if checkpoint is None and not self.verify_year_types:
+            # The warm-up lies within the preceding year, save for a few days
+            # of Christmastide before it, and so its type determines the
+            # checkpoint.
+            pending = self._year_type_checkpoints.get(self.year_type(year - 1))
+            if pending is not None:
+                checkpoint = TransferCheckpoint(
+                    self.transfer_checkpoint_date(year), pending)
+                self._transfer_checkpoints[year] = checkpoint
+        return checkpoint
+
+    def _record_transfer_checkpoint(self, year, pending):
+        year_type = self.year_type(year - 1)
+        memoised = self._year_type_checkpoints.get(year_type)
+        if memoised not in (None, pending):
+            raise AssertionError(
+                "Memoised checkpoint for %d disagrees with resolution: "
+                "%r != %r" % (year, memoised, pending))
+        self._year_type_checkpoints[year_type] = pending
+        self._transfer_checkpoints[year] = TransferCheckpoint(
+            self.transfer_checkpoint_date(year), pending)
+
+    def calendar_fingerprint(self):
+        """Returns a digest identifying the calendar data, the rubrics in use
+        and the version of their rules, against which persisted transfer state
+        is validated.
+        """
+        if self._calendar_fingerprint is None:
+            digest = hashlib.sha256(('%s-%d' % (self.__class__.__name__,
+                                                self.RULES_VERSION)).encode())
+            dictionary = self._data_map.dictionary
+            calendar = sorted((key, value)
+                              for (key, value) in dictionary.items()
+                              if key.startswith('calendarium/'))
+            # The data is frozen, so its mappings need converting back.
+            digest.update(json.dumps(calendar, sort_keys=True,
+                                     default=dict).encode())
+            self._calendar_fingerprint = digest.hexdigest()
+        return self._calendar_fingerprint
+
+    def save_transfer_checkpoints(self, path):
+        """Writes all known transfer checkpoints to the specified file."""
+        saved = {
+            'fingerprint': self.calendar_fingerprint(),
+            # Offices are saved by ID, as in the ordo store.  Checkpoints with
+            # offices that didn't come from the calendar can't be saved, and
+            # will be recomputed.
+            'checkpoints': {
+                str(year): [office.office_id for office in checkpoint.pending]
+                for (year, checkpoint) in self._transfer_checkpoints.items()
+                if all(office.office_id is not None
+                       for office in checkpoint.pending)
+            },
+        }
+
+        with atomic_write(path, encoding='utf-8') as f:
+            json.dump(saved, f, sort_keys=True)
+
+    def load_transfer_checkpoints(self, path):
+        """Reads transfer checkpoints from a file written by
+        save_transfer_checkpoints().  Returns False, loading nothing, if the
+        file was written for different calendar data or rubrics, or can't be
+        parsed.
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved['fingerprint'] != self.calendar_fingerprint():
+                return False
+            checkpoints = {
+                int(year): TransferCheckpoint(
+                    self.transfer_checkpoint_date(int(year)),
+                    tuple(self.office_by_id(tuple(office_id))
+                          for office_id in office_ids),
+                )
+                for (year, office_ids) in saved['checkpoints'].items()
+            }
+        except (ValueError, KeyError, IndexError, TypeError):
+            return False
+        self._transfer_checkpoints.update(checkpoints)
+        return True
+
+    def office_by_id(self, office_id):
+        """Returns the office from the calendar with the specified ID."""
+        rubrics, calpoint, index = office_id
+        assert rubrics == self.__class__.__name__, office_id
+        calpoint = self.calpoint_table().intern(calpoint)
+        return self.calpoint_offices(calpoint)[index]
+
+    def resolve_transfer_year(self, year):
+        """Returns a tuple containing, for each day of the specified year, a
+        tuple of the offices occurring on that day after transfer.  These are
+        served from the transfer cache where possible, and otherwise from the
+        ordo store, if the resolver has one, or from an earlier year of the
+        same type.
+        """
+        return tuple(self._transfer_days(Date(year, 1, 1),
+                                         Date(year, 12, 31)))
+
+    def _known_transfer_year(self, year):
+        block = self._transfer_cache.get(year)
+        if block is None:
+            block = self._read_ordo_store(year)
+        if block is None and not self.verify_year_types:
+            checkpoint = self._known_transfer_checkpoint(year)
+            if checkpoint is not None:
+                block = self._year_type_blocks.get((self.year_type(year),
+                                                    checkpoint.pending))
+                if block is not None:
+                    self._transfer_cache.put(year, block)
+                    self._write_ordo_store(year, block)
+        return block
+
+    def _store_transfer_year(self, year, block):
+        key = (self.year_type(year), self._transfer_checkpoints[year].pending)
+        memoised = self._year_type_blocks.get(key)
+        if memoised not in (None, block):
+            raise AssertionError(
+                "Memoised transfers for %d disagree with resolution" % (year,))
+        self._year_type_blocks[key] = block
+        self._transfer_cache.put(year, block)
+        self._write_ordo_store(year, block)
+
+    def _transfer_days(self, start, end):
+        """Generates a tuple of the offices occurring after transfer on each
+        day from start to end inclusive.  Years already resolved are served
+        as in resolve_transfer_year().  Others are resolved by continuing the
+        resolver's TransferWalk, or else by starting a new one.
+        """
+        date = start
+        while date <= end:
+            year = date.year
+            last = min(end, Date(year, 12, 31))
+            block = self._known_transfer_year(year)
+            if block is not None:
+                first = Date(year, 1, 1)
+                yield from block[date - first:last - first + 1]
+            else:
+                walk = self._transfer_walk_for(date)
+                self._advance_transfer_walk(walk, last)
+                yield from walk.days[date - walk.first:last - walk.first + 1]
+            date = last + 1
+
+    def _transfer_walk_for(self, date):
+        # Continue the current walk if it has already resolved the date, or
+        # can reach it as cheaply as a new one.
+        checkpoint = self._known_transfer_checkpoint(date.year)
+        if checkpoint is None:
+            new_walk = self._cold_transfer_walk(date)
+        else:
+            new_walk = TransferWalk(
+                self.transfer_session(checkpoint.date, checkpoint.pending),
+                date.year)
+        walk = self._transfer_walk
+        if (walk is None or date < walk.first or
+            walk.session.date < new_walk.session.date):
+            walk = self._transfer_walk = new_walk
+        return walk
+
+    def _cold_transfer_walk(self, date):
+        # Warm up for the date itself, rather than for its year's checkpoint,
+        # so as to resolve only the days on which the date depends.
+        start = self._transfer_warm_up_date(date)
+        year = start.year
+        while self.transfer_checkpoint_date(year) < start:
+            year += 1
+        return TransferWalk(self.transfer_session(start), year, cold=True)
+
+    @staticmethod
+    def _transfer_warm_up_date(date):
+        # Offices can be transferred by up to a year, so start from a year
+        # ago, rounded down to a Sunday, with nothing awaiting transfer.
+        start = date - 366
+        return start - start.day_of_week
+
+    def _advance_transfer_walk(self, walk, end):
+        """Resolves every day up to the specified date with the walk.  On the
+        way, records the checkpoint of each year that it reaches, and keeps
+        each whole year that it resolves.
+        """
+        session = walk.session
+        try:
+            while session.date <= end:
+                date = session.date
+                year = walk.checkpoint_year
+                if date == self.transfer_checkpoint_date(year):
+                    # A cold walk agrees with the checkpoint only if it
+                    # started no later than the usual warm-up for it.
+                    if walk.settled_year is None and (
+                        walk.origin is None or
+                        walk.origin <= self._transfer_warm_up_date(
+                            Date(year, 1, 1))):
+                        walk.settled_year = year
+                    if walk.settled_year is not None:
+                        self._record_transfer_checkpoint(
+                            year, session.pending_transfers)
+                    walk.checkpoint_year += 1
+                if date.month == 1 and date.day == 1:
+                    walk.first = date
+                    walk.days = []
+                    walk.whole_year = (walk.settled_year is not None and
+                                       walk.settled_year <= date.year)
+                (date, offices) = next(session)
+                walk.days.append(tuple(offices))
+                if date.month == 12 and date.day == 31 and walk.whole_year:
+                    self._store_transfer_year(date.year, tuple(walk.days))
+        except BaseException:
+            # The session may have been left part-way through a day.
+            if self._transfer_walk is walk:
+                self._transfer_walk = None
+            raise
+
+    def _read_ordo_store(self, year):
+        if self._ordo_store is None:
+            return None
+        days = self._ordo_store.read(self.__class__.__name__,
+                                     self.calendar_fingerprint(), year)
+        if days is None:
+            return None
+        if len(days) != Date(year, 12, 31) - Date(year, 1, 1) + 1:
+            return None
+        # An ID that no longer names an office means that the store is stale,
+        # in which case the year is regenerated.
+        try:
+            block = tuple(tuple(self.office_by_id(office_id)
+                                for office_id in office_ids)
+                          for office_ids in days)
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+        self._transfer_cache.put(year, block)
+        return block
+
+    def _write_ordo_store(self, year, block):
+        # Offices that didn't come from the calendar have no ID, and so can't
+        # be stored.
+        if self._ordo_store is None or any(office.office_id is None
+                                           for offices in block
+                                           for office in offices):
+            return
+        self._ordo_store.write(self.__class__.__name__,
+                               self.calendar_fingerprint(), year,
+                               [[office.office_id for office in offices]
+                                for offices in block])
+
+    def resolve_transfer(self, start, end):
+        assert start <= end
+
+        return [list(offices) for offices in self._transfer_days(start, end)]
 
     @classmethod
     def hour_classes(cls, office):
@@ -568,7 +1598,8 @@ class CalendarResolver(ABC):
 
     @classmethod
     def concurrence_omit(cls, preceding, following, date):
-        winner, resn = cls.concurrence_resolution(preceding, following, date)
+        winner, resn = cls.resolve_concurrence_pair(preceding, following,
+                                                   date)
         if resn != Resolution.OMIT:
             return None
         return preceding if winner is following else following
@@ -633,7 +1664,64 @@ class CalendarResolver(ABC):
 
     def offices(self, date):
         today, tomorrow = self.resolve_transfer(date, date + 1)
+        return self._hours(date, today, tomorrow)
+
+    def offices_range(self, start, end):
+        """Generates (date, hours) pairs for every date from start to end
+        inclusive, where hours is as returned by offices().  Each day's
+        offices are resolved once, serving as tomorrow's and then as
+        today's, rather than twice as with repeated calls to offices().
+        """
+        assert start <= end
+        days = self._transfer_days(start, end + 1)
+        tomorrow = next(days, None)
+        date = start
+        while date <= end:
+            today, tomorrow = tomorrow, next(days, None)
+            if tomorrow is None:
+                raise RuntimeError("Transfer resolution ended before %s" %
+                                   (date + 1,))
+            # _hours() modifies its lists, and tomorrow's are needed again.
+            yield (date, self._hours(date, list(today), list(tomorrow)))
+            date += 1
+
+    def _hours(self, date, today, tomorrow):
+        temporal_calpoint = self.temporal_calpoint_id(date)
 
+        # Get seasonal keys, which in practice means the months from August to
+        # November.  These are strictly weekly, so only for Sundays do we have
+        # first Vespers.  TODO: This won't work for Matins, and is wrong in
+        # principle for Lauds.
+        reading_date = date + 1 if date.day_of_week == 6 else date
+        reading_day = self.reading_day(reading_date)
+
+        # Besides the offices, the arrangement of the hours depends on the date
+        # only through these, so it is memoised on them.
+        key = (tuple(today), tuple(tomorrow), temporal_calpoint, reading_day,
+               5 <= date.month <= 7, self.day_plan_date_key(date))
+        plan = self._day_plan_memo.get(key)
+        if plan is None:
+            plan = self._day_plan(date, today, tomorrow, temporal_calpoint,
+                                  reading_date, reading_day)
+            self._day_plan_memo.put(key, plan)
+
+        seasons = list(plan.seasons)
+        season_keys = list(plan.season_keys)
+        return OrderedDict([
+            ('lauds', [cls(date, self._data_map, self._index, self, seasons,
+                           season_keys, plan.doxology, lauds_office,
+                           list(plan.lauds_commemorations))
+                       for (cls, lauds_office) in plan.lauds]),
+            ('vespers', [cls(date, self._data_map, self._index, self, seasons,
+                             season_keys, plan.doxology, vespers_office,
+                             list(plan.morning_offices),
+                             list(plan.concurring),
+                             list(plan.vespers_commemorations))
+                         for (cls, vespers_office) in plan.vespers]),
+        ])
+
+    def _day_plan(self, date, today, tomorrow, temporal_calpoint,
+                  reading_date, reading_day):
         # Find evening offices.
         occurring = [office for office in today
                      if self.has_second_vespers(office, date)]
@@ -662,14 +1750,14 @@ class CalendarResolver(ABC):
             if offices:
                 offices[:] = [offices[0]] + [
                     office for office in offices[1:]
-                    if self.occurrence_resolution(offices[0], office)[1] !=
+                    if self.resolve_occurrence_pair(offices[0], office)[1] !=
                     Resolution.OMIT
                 ]
 
         # Arbitrate between occurring and concurring.
         if occurring and concurring:
-            office, _ = self.concurrence_resolution(occurring[0], concurring[0],
-                                                    date)
+            office, _ = self.resolve_concurrence_pair(occurring[0],
+                                                      concurring[0], date)
         elif occurring:
             office = occurring[0]
         else:
@@ -689,17 +1777,9 @@ class CalendarResolver(ABC):
                                                      concurring_commem)
 
         season = None
-        temporal_calpoint = self.temporal_calpoint(date)
-        if temporal_calpoint:
-            season, _, _ = self.split_calpoint(temporal_calpoint)
-            season = season.lower()
+        if temporal_calpoint is not None:
+            season = self.calpoint_table().season(temporal_calpoint).lower()
 
-        # Get seasonal keys, which in practice means the months from August to
-        # November.  These are strictly weekly, so only for Sundays do we have
-        # first Vespers.  TODO: This won't work for Matins, and is wrong in
-        # principle for Lauds.
-        reading_date = date + 1 if date.day_of_week == 6 else date
-        reading_day = self.reading_day(reading_date)
         if reading_day is not None:
             season_keys = [self.reading_day_str(reading_date)]
         else:
@@ -712,7 +1792,8 @@ class CalendarResolver(ABC):
         if (occurring and concurring and
             office is occurring[0] and
             concurring[0] in commemorations):
-            _, resn = self.concurrence_resolution(office, concurring[0], date)
+            _, resn = self.resolve_concurrence_pair(office, concurring[0],
+                                                    date)
             if resn == Resolution.APPEND:
                 vespers_offices.append(concurring[0])
                 commemorations = [c for c in commemorations
@@ -734,19 +1815,12 @@ class CalendarResolver(ABC):
             # Invent a season to allow for the summer Matins and Lauds parts.
             seasons.append('in-aestate')
 
-        return OrderedDict([
-            ('lauds', [cls(date, self._data_map, self._index, self, seasons,
-                           season_keys, doxology, lauds_office, today[1:])
-                       for (cls, lauds_office) in zip(lauds_classes,
-                                                      lauds_offices)]),
-            ('vespers', [cls(date, self._data_map, self._index, self, seasons,
-                             season_keys, doxology, vespers_office, today,
-                             concurring,
-                             self.vespers_commem_filter(commemorations, date,
-                                                        concurring))
-                         for (cls, vespers_office) in zip(vespers_classes,
-                                                          vespers_offices)]),
-        ])
+        return DayPlan(
+            seasons, season_keys, doxology,
+            zip(lauds_classes, lauds_offices), today[1:],
+            zip(vespers_classes, vespers_offices), today, concurring,
+            self.vespers_commem_filter(commemorations, date, concurring),
+        )
 
     @property
     def titular_path(self):
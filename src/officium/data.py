@@ -1,25 +1,302 @@
-import copy
+from collections.abc import Mapping
+import types
+
+from .cache import LRUCache
 
 
 class DataValidationError(Exception):
     pass
 
 
-class Data:
-    def __init__(self, dictionary):
-        self.dictionary = dictionary.copy()
-        self.redirections = {}
+def freeze(value):
+    """Returns a read-only version of a value from the data, with lists
+    replaced by tuples and dictionaries by read-only mappings, recursively.
+    Tuples and read-only mappings are taken to be frozen already, so that
+    frozen values are shared rather than copied.
+    """
+    if isinstance(value, (tuple, types.MappingProxyType)):
+        return value
+    elif isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    elif isinstance(value, dict):
+        return types.MappingProxyType({key: freeze(item)
+                                       for (key, item) in value.items()})
+    return value
+
+
+class _RedirectionNode:
+    __slots__ = ('target', 'children')
+
+    def __init__(self):
+        self.target = None
+        self.children = {}
+
+
+class RedirectionResolver:
+    """A set of redirections compiled into a trie on the components of their
+    names.  resolve() gives the keys to try for a key: the key itself, then
+    for each redirected prefix, longest first, everything that the redirected
+    key resolves to in turn.  Results are memoised.  Expansion stops at a
+    cycle, so that the keys reached before it are still tried; validate()
+    reports such redirections.
+    """
+
+    # Bound on the length of a chain of redirections, which stops redirections
+    # that grow a key without end.
+    MAX_DEPTH = 64
+
+    # Number of keys for which to remember the resolution.
+    MEMO_SIZE = 65536
+
+    def __init__(self, redirections):
+        self._redirections = redirections
+        self._root = _RedirectionNode()
+        for (name, target) in redirections.items():
+            node = self._root
+            for component in name.split('/'):
+                node = node.children.setdefault(component, _RedirectionNode())
+            node.target = target
+        self._memo = LRUCache(self.MEMO_SIZE)
+
+    @property
+    def memo(self):
+        return self._memo
+
+    def resolve(self, key):
+        """Returns a tuple of the keys to try for the specified key, in
+        order, without repetition.
+        """
+        resolved = self._memo.get(key)
+        if resolved is None:
+            keys = {}
+            self._expand(key, [key], keys)
+            resolved = tuple(keys)
+            self._memo.put(key, resolved)
+        return resolved
+
+    def validate(self):
+        """Raises DataValidationError, listing every offending redirection,
+        if any of the redirections form a cycle or nest too deeply.
+        """
+        problems = {}
+        for (name, target) in self._redirections.items():
+            if target == name or target.startswith(name + '/'):
+                problems["Redirection cycle: %s -> %s" % (name, target)] = None
+            else:
+                self._expand(name, [name], {}, problems)
+        if problems:
+            raise DataValidationError("Bad redirections:\n  " +
+                                      '\n  '.join(problems))
+
+    def _expand(self, key, path, keys, problems=None):
+        # Expanding a key that has already been tried can only produce further
+        # keys that have already been tried.  A cycle or an overly deep chain
+        # is expanded no further, and recorded in problems when given.
+        keys[key] = None
+        components = key.split('/')
+        for (length, target) in reversed(self._prefixes(components)):
+            redirected = '/'.join([target] + components[length:])
+            if redirected in path:
+                if problems is not None:
+                    problems["Redirection cycle: %s" % (
+                        ' -> '.join(path[path.index(redirected):] +
+                                    [redirected]),)] = None
+            elif len(path) > self.MAX_DEPTH:
+                if problems is not None:
+                    problems["Redirections from %s nested more than %d deep" %
+                             (path[0], self.MAX_DEPTH)] = None
+            elif redirected not in keys:
+                path.append(redirected)
+                self._expand(redirected, path, keys, problems)
+                path.pop()
+
+    def redirects_under(self, path):
+        """Returns whether any key beneath the specified path is redirected,
+        either because a prefix of the path is or because some redirected name
+        lies beneath it.
+        """
+        node = self._root
+        for component in path.split('/'):
+            node = node.children.get(component)
+            if node is None:
+                return False
+            if node.target is not None:
+                return True
+        return True
+
+    def _prefixes(self, components):
+        # Returns (length, target) pairs for the redirected prefixes of a key,
+        # shortest first.
+        prefixes = []
+        node = self._root
+        for (length, component) in enumerate(components, 1):
+            node = node.children.get(component)
+            if node is None:
+                break
+            if node.target is not None:
+                prefixes.append((length, node.target))
+        return prefixes
+
+
+class KeyIndex:
+    """A set of keys, with redirections, against which lookup() finds the
+    first of a sequence of candidate keys that exists.  No values are held,
+    so an index over several dictionaries shares their keys rather than
+    copying them.  The redirections are compiled on first use after they
+    change, so a shared mapping should be complete by then.
+
+    Optionally, a bounded cache of the candidate keys for which lookup() found
+    nothing, even after redirection, lets later lookups skip them.  It is
+    exact, and is cleared whenever the keys or redirections change through
+    this class.
+    """
+
+    def __init__(self, keys, redirections=None, miss_cache_size=None):
+        self._keys = keys
+        self._key_prefixes = None
+        self._miss_cache = (LRUCache(miss_cache_size) if miss_cache_size else
+                            None)
 
-    def lookup(self, keys):
+        # Counts of calls to lookup(), of those that found nothing, and of
+        # keys probed, after redirection, that weren't found.
+        self.lookups = 0
+        self.failures = 0
+        self.missed_keys = 0
+
+        self.redirections = {} if redirections is None else redirections
+
+    @property
+    def redirections(self):
+        return self._redirections
+
+    @redirections.setter
+    def redirections(self, redirections):
+        self._redirections = redirections
+        self._invalidate()
+
+    def _invalidate(self):
+        # Called whenever the keys or redirections change.
+        self._redirection_resolver = None
+        self._key_prefixes = None
+        if self._miss_cache is not None:
+            self._miss_cache.clear()
+
+    @property
+    def lookup_stats(self):
+        """Returns statistics of the lookups made so far: how many probed
+        keys missed, and the state of the redirection memo, including its
+        estimated memory use, or None if the redirections haven't been
+        compiled since they last changed.  The same is given for the miss
+        cache, with its false-positive rate, if it is enabled.
+        """
+        found_keys = self.lookups - self.failures
+        probed_keys = found_keys + self.missed_keys
+        resolver = self._redirection_resolver
+        if resolver is None:
+            memo_stats = None
+        else:
+            memo_stats = dict(resolver.memo.stats, memory=resolver.memo.memory)
+        miss_cache = self._miss_cache
+        if miss_cache is None:
+            miss_cache_stats = None
+        else:
+            # The cache holds only keys found to be missing, and is cleared
+            # when that could change, so a hit is never a false positive.
+            miss_cache_stats = dict(miss_cache.stats,
+                                    memory=miss_cache.memory,
+                                    false_positive_rate=0.0)
+        return {
+            'lookups': self.lookups,
+            'failures': self.failures,
+            'missed_keys': self.missed_keys,
+            'miss_rate': (self.missed_keys / probed_keys if probed_keys else
+                          None),
+            'redirection_memo': memo_stats,
+            'miss_cache': miss_cache_stats,
+        }
+
+    @property
+    def redirection_resolver(self):
+        """Returns the RedirectionResolver for the current redirections,
+        compiling it if necessary.
+        """
+        if self._redirection_resolver is None:
+            self._redirection_resolver = RedirectionResolver(
+                self._redirections)
+        return self._redirection_resolver
+
+    def validate_redirections(self):
+        """Checks the redirections once, raising DataValidationError for any
+        that form a cycle or nest too deeply.
+        """
+        self.redirection_resolver.validate()
+
+    @property
+    def key_prefixes(self):
+        """Returns the set of proper prefixes of the keys, built on first
+        use.
+        """
+        if self._key_prefixes is None:
+            self._key_prefixes = set()
+            for key in self._keys:
+                components = key.split('/')
+                for length in range(1, len(components)):
+                    self._key_prefixes.add('/'.join(components[:length]))
+        return self._key_prefixes
+
+    def has_subtree(self, path):
+        """Returns whether lookup() could find anything beneath the specified
+        path.  If not, candidate keys beneath it needn't be generated at all.
+        """
+        return (path in self.key_prefixes or
+                self.redirection_resolver.redirects_under(path))
+
+    def lookup(self, keys, reported_keys=None):
+        """Returns the first of the specified keys, after redirection, that is
+        in the index.  If there is none, reported_keys, when given, is
+        consumed in place of keys to describe the failure.
+        """
         keys = list(keys) # XXX: See below
+        resolve = self.redirection_resolver.resolve
+        miss_cache = self._miss_cache
+        self.lookups += 1
         for key in keys:
-            for real_key in self.gen_redirections(key):
-                if real_key in self.dictionary:
+            if miss_cache is not None and miss_cache.get(key):
+                continue
+            for real_key in resolve(key):
+                if real_key in self._keys:
                     return real_key
+                self.missed_keys += 1
+            if miss_cache is not None:
+                miss_cache.put(key, True)
+        self.failures += 1
+        if reported_keys is not None:
+            keys = list(reported_keys)
         # XXX: For bringup, return a string rather than raising.
         return "NOT FOUND: %s " % (keys,)
         raise KeyError(keys)
 
+    def gen_redirections(self, key):
+        # First, try with no redirections at all.  Then try all possible
+        # redirections, starting with the longest.
+        yield from self.redirection_resolver.resolve(key)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+
+class Data(KeyIndex):
+    """A KeyIndex over a dictionary of values.  The values are frozen, so that
+    they can be shared between Data instances and with the records from which
+    they were created.  Layering records over one another replaces values
+    rather than modifying them.
+    """
+
+    def __init__(self, dictionary, miss_cache_size=None):
+        self.dictionary = {key: freeze(value)
+                           for (key, value) in dictionary.items()}
+        super().__init__(self.dictionary, miss_cache_size=miss_cache_size)
+
     def get(self, *args, **kwargs):
         return self.dictionary.get(*args, **kwargs)
 
@@ -31,37 +308,26 @@ class Data:
 
     def create(self, d):
         for key in d:
-            self.dictionary[key] = copy.deepcopy(d[key])
+            self.dictionary[key] = freeze(d[key])
+        self._invalidate()
 
     def append(self, d):
         for key in d:
-            entries = self.dictionary.setdefault(key, [])
-            entries += copy.deepcopy(d[key])
+            self.dictionary[key] = (self.dictionary.get(key, ()) +
+                                    freeze(d[key]))
+        self._invalidate()
 
     def redirect(self, redirection_dict):
         for (redirect_name, target) in redirection_dict.items():
-            assert redirect_name not in self.redirections
-            self.redirections[redirect_name] = target
-
-    def gen_redirections(self, key):
-        # TODO: Check for cycles.
-
-        # First, try with no redirections at all.
-        yield key
-        components = key.split('/')
-        # Then try all possible redirections, starting with the longest.
-        for prefix_len in range(len(components), 0, -1):
-            prefix = '/'.join(components[0:prefix_len])
-            if prefix in self.redirections:
-                redirected_path = '/'.join([self.redirections[prefix]] +
-                                           components[prefix_len:])
-                yield from self.gen_redirections(redirected_path)
+            assert redirect_name not in self._redirections
+            self._redirections[redirect_name] = target
+        self._invalidate()
 
 
 def maybe_labelled(raw, labels, default_class):
     meta = {}
     cls = default_class
-    if isinstance(raw, dict):
+    if isinstance(raw, Mapping):
         try:
             meta = dict(raw)
             value = meta.pop('content')
@@ -1,3 +1,4 @@
+import functools
 import re
 
 from officium.offices import Rite, Standing
@@ -110,30 +111,48 @@ class CalendarResolverDA(CalendarResolver):
                     Resolution.TRANSLATE if rank <= 2 else
                     Resolution.COMMEMORATE)
 
+    @staticmethod
+    def lent_or_first_order_octave(office):
+        if isinstance(office, (LentenFeria, LentenSunday)):
+            return True
+        if (isinstance(office, (WithinOctave, OctaveDay)) and
+            office.octave_order == 1):
+            return True
+        if isinstance(office, Vigil) and office.rank == 1:
+            return True
+        return False
+
+    @staticmethod
+    def lesser_feria(office):
+        return isinstance(office, Feria) and office.standing == Standing.LESSER
+
+    @classmethod
+    def precedence_keys(cls, offices):
+        # Lesser ferias always lose, and otherwise higher-ranked days win,
+        # except that octaves cease in Lent and in the first-order octaves
+        # irrespective of rank.  In that case there is no simple ordering.
+        lent = [office for office in offices
+                if cls.lent_or_first_order_octave(office)]
+        octaves = [office for office in offices
+                   if isinstance(office, (WithinOctave, OctaveDay))]
+        if any(octave is not office for octave in octaves for office in lent):
+            return None
+        return [(cls.lesser_feria(office), office.rank) for office in offices]
+
     @classmethod
     def occurrence_resolution(cls, a, b):
         # Lesser ferias are always omitted in occurrence.  XXX: With simple
         # feasts and Ember Days and suchlike this becomes complicated... see
         # RG V.2.
-        if isinstance(a, Feria) and a.standing == Standing.LESSER:
+        if cls.lesser_feria(a):
             a, b = b, a
-        if isinstance(b, Feria) and b.standing == Standing.LESSER:
+        if cls.lesser_feria(b):
             return (a, Resolution.OMIT)
 
         # (Other) octaves cease in Lent and the two first-order octaves.
-        def lent_or_first_order_octave(office):
-            if isinstance(office, (LentenFeria, LentenSunday)):
-                return True
-            if (isinstance(office, (WithinOctave, OctaveDay)) and
-                office.octave_order == 1):
-                return True
-            if isinstance(office, Vigil) and office.rank == 1:
-                return True
-            return False
-
-        if lent_or_first_order_octave(a):
+        if cls.lent_or_first_order_octave(a):
             a, b = b, a
-        if (lent_or_first_order_octave(b) and
+        if (cls.lent_or_first_order_octave(b) and
             isinstance(a, (WithinOctave, OctaveDay))):
             return (b, Resolution.OMIT)
 
@@ -243,6 +262,45 @@ class CalendarResolverDA(CalendarResolver):
             True
         ].index(True)
 
+    # Concurrence ranks of some faked-up offices, against which the ranks of
+    # real offices are compared in concurrence_resolution().  These are
+    # computed on first use.
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def conc_rank_within_common_octave(cls):
+        return cls.concurrence_rank(WithinOctave({
+            'octavae_ordo': 4,
+            'ritus': 'semiduplex',
+        }))
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def conc_rank_semidouble(cls):
+        return cls.concurrence_rank(Feast({
+            'ritus': 'semiduplex',
+            'classis': 3,
+        }))
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def conc_rank_common_octave_day(cls):
+        return cls.concurrence_rank(OctaveDay({
+            'ritus': 'duplex majus',
+            'classis': 3,
+            'octavae_ordo': 4,
+        }))
+
+    @staticmethod
+    def concurrence_date_key(date):
+        # Concurrence doesn't depend on the date at all.
+        return None
+
+    @staticmethod
+    def day_plan_date_key(date):
+        # Neither does anything else in the arrangement of the hours.
+        return None
+
     @classmethod
     def concurrence_resolution(cls, preceding, following, date):
         preceding_conc_rank = cls.concurrence_rank(preceding)
@@ -263,15 +321,9 @@ class CalendarResolverDA(CalendarResolver):
         if preceding_conc_rank < following_conc_rank:
             # Office of preceding. What to do with the following?
 
-            # Find the rank of a faked-up day within a common octave.
-            within_common_octave = cls.concurrence_rank(WithinOctave({
-                'octavae_ordo': 4,
-                'ritus': 'semiduplex',
-            }))
-
             # Omit low-ranking days at first vespers of high-ranking doubles.
             if (preceding.rite == Rite.DOUBLE and preceding.rank <= 2 and
-                following_conc_rank >= within_common_octave):
+                following_conc_rank >= cls.conc_rank_within_common_octave()):
                 resolution = Resolution.OMIT
 
             # Don't commemorate first vespers of the second day in the octave
@@ -315,16 +367,11 @@ class CalendarResolverDA(CalendarResolver):
             # Doubles of the I. or II. class cause low-ranking days to be
             # omitted in concurrence.
             elif following.rite == Rite.DOUBLE:
+                octave_day_rank = cls.conc_rank_common_octave_day()
                 if ((following.rank == 2 and
-                     preceding_conc_rank >= cls.concurrence_rank(Feast(
-                        {'ritus': 'semiduplex', 'classis': 3}
-                     ))) or
+                     preceding_conc_rank >= cls.conc_rank_semidouble()) or
                     (following.rank == 1 and
-                     preceding_conc_rank >= cls.concurrence_rank(OctaveDay({
-                        'ritus': 'duplex majus',
-                        'classis': 3,
-                        'octavae_ordo': 4,
-                     })))):
+                     preceding_conc_rank >= octave_day_rank)):
                     resolution = Resolution.OMIT
 
             return (following, resolution)
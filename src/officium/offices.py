@@ -1,28 +1,131 @@
 # XXX: This module still has scars from the time when it tried to manage the
 # keys for the various office-parts.
 
+import enum
+import types
+
 from .util import roman
 
 
-class Rite:
+class Rite(enum.IntEnum):
     SIMPLE = 0
     SEMIDOUBLE = 1
     DOUBLE = 2
     GREATER_DOUBLE = 3
 
 
-class Standing:
+class Standing(enum.IntEnum):
     LESSER = 0
     GREATER = 1
     GREATER_PRIVILEGED = 2
 
 
+_rites = {
+    'duplex maius': Rite.GREATER_DOUBLE,
+    'duplex': Rite.DOUBLE,
+    'semiduplex': Rite.SEMIDOUBLE,
+    'simplex': Rite.SIMPLE,
+}
+
+
+_standings = {
+    'maior privilegiata': Standing.GREATER_PRIVILEGED,
+    'maior': Standing.GREATER,
+    'minor': Standing.LESSER,
+}
+
+
 class Office:
     extra_keys = []
     penitential_lauds = False
 
-    def __init__(self, desc):
-        self.desc = dict(desc)
+    # The properties that rules of occurrence and concurrence may consult,
+    # besides the class of the office.  See rubrical_signature.
+    rubrical_fields = (
+        'rank',
+        'rite',
+        'standing',
+        'octave_order',
+        'universal',
+        'prefer_to_sundays',
+        'of_the_lord',
+    )
+
+    __slots__ = (
+        'desc',
+        'office_id',
+        '_rank',
+        '_rite',
+        '_standing',
+        '_octave_order',
+        '_octave_id',
+        '_rubrics',
+        '_rubrical_signature',
+    )
+
+    # The slots can be assigned only through _set_fields(), since offices
+    # forbid assignment.  Declare them so that pylint knows of them.  Several
+    # may be None; see __init__().
+    desc: types.MappingProxyType
+    office_id: tuple
+    _rank: int
+    _rite: Rite
+    _standing: Standing
+    _octave_order: int
+    _octave_id: str
+    _rubrics: frozenset
+    _rubrical_signature: tuple
+
+    def __init__(self, desc, office_id=None):
+        """The office ID, if specified, is a hashable value identifying the
+        office canonically: offices with equal IDs are equal, and those
+        without an ID are equal only to themselves.  Resolvers give offices
+        from the calendar IDs of the form (rubrics, calpoint, index).
+        """
+        desc = dict(desc)
+
+        # Parse the fields that the rubrical code consults most often.  Some
+        # descriptors (faked-up ones especially) lack the rank or rite, which
+        # is an error only if somebody asks for them; we record None and raise
+        # from the property in that case.
+        ritus = desc.get('ritus')
+        self._set_fields(
+            desc=types.MappingProxyType(desc),
+            office_id=office_id,
+            _rank=desc.get('classis'),
+            _rite=None if ritus is None else _rites[ritus.replace('j', 'i')],
+            _standing=_standings[
+                desc.get('status', 'minor').replace('j', 'i')
+            ],
+            _octave_order=int(desc.get('octavae_ordo', 6)),
+            _octave_id=desc.get('octavae_nomen'),
+            _rubrics=frozenset(desc.get('rubricae', [])),
+            _rubrical_signature=None,
+        )
+
+    def _set_fields(self, **fields):
+        # Offices are immutable, since the resolver shares a single instance
+        # of each between every day on which it occurs.
+        for (name, value) in fields.items():
+            super().__setattr__(name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is immutable" % (self.__class__.__name__,))
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self.desc), self.office_id))
+
+    def __eq__(self, other):
+        if not isinstance(other, Office):
+            return NotImplemented
+        if self.office_id is None or other.office_id is None:
+            return self is other
+        return self.office_id == other.office_id
+
+    def __hash__(self):
+        if self.office_id is None:
+            return super().__hash__()
+        return hash(self.office_id)
 
     def __str__(self):
         return "%s: %s" % (self.__class__.__name__, self.title())
@@ -51,16 +154,15 @@ class Office:
 
     @property
     def rank(self):
-        return self.desc['classis']
+        if self._rank is None:
+            raise KeyError('classis')
+        return self._rank
 
     @property
     def rite(self):
-        return {
-            'duplex maius': Rite.GREATER_DOUBLE,
-            'duplex': Rite.DOUBLE,
-            'semiduplex': Rite.SEMIDOUBLE,
-            'simplex': Rite.SIMPLE,
-        }[self.desc['ritus'].replace('j', 'i')]
+        if self._rite is None:
+            raise KeyError('ritus')
+        return self._rite
 
     @property
     def keys(self):
@@ -68,11 +170,7 @@ class Office:
 
     @property
     def standing(self):
-        return {
-            'maior privilegiata': Standing.GREATER_PRIVILEGED,
-            'maior': Standing.GREATER,
-            'minor': Standing.LESSER,
-        }[self.desc.get('status', 'minor').replace('j', 'i')]
+        return self._standing
 
     @property
     def octave_order(self):
@@ -80,18 +178,39 @@ class Office:
         # other things above.  Note that we synthesise a descriptor containing
         # the octavae_ordo field in at least one place, so fix that/those up
         # too.
-        return int(self.desc.get('octavae_ordo', 6))
+        return self._octave_order
 
     @property
     def octave_id(self):
-        return self.desc.get('octavae_nomen')
+        return self._octave_id
 
     @property
     def hours_key(self):
         return self.desc.get('officium', 'communis')
 
+    @property
+    def rubrical_signature(self):
+        """A hashable summary of everything about the office that can affect
+        its resolution in occurrence or concurrence, such that offices with
+        equal signatures are interchangeable there.
+        """
+        if self._rubrical_signature is None:
+            def field(name):
+                try:
+                    return getattr(self, name)
+                except (AttributeError, KeyError):
+                    # Not every class of office has every field, and an
+                    # incomplete descriptor is an error only if the rules
+                    # actually consult the missing field, in which case they
+                    # will raise for themselves.
+                    return None
+            self._set_fields(_rubrical_signature=(self.__class__,) + tuple(
+                field(name) for name in self.rubrical_fields
+            ))
+        return self._rubrical_signature
+
     def _has_rubric(self, rubric):
-        return rubric in self.desc.get('rubricae', [])
+        return rubric in self._rubrics
 
     @property
     def second_vespers_suppressed(self):
@@ -120,6 +239,8 @@ class Office:
 
 
 class Feast(Office):
+    __slots__ = ()
+
     @property
     def of_the_lord(self):
         return False
@@ -132,50 +253,62 @@ class Feast(Office):
 # XXX: Having TemporalOffice in the class hierarchy is wrong, because some
 # types of office (feasts, vigils, ...) can be temporal or sanctoral.
 class TemporalOffice(Office):
+    __slots__ = ()
+
     @property
     def week_num(self):
         return self.desc['hebdomada']
 
 
 class Sunday(TemporalOffice):
-    pass
+    __slots__ = ()
 
 
 class Feria(TemporalOffice):
-    pass
+    __slots__ = ()
 
 
 class SundayPerAnnum(Sunday):
-    pass
+    __slots__ = ()
 
 
 class SundayAfterPentecost(SundayPerAnnum):
+    __slots__ = ()
+
     def title(self):
         return "Dominica %s. post Pentecosten" % (roman(self.week_num),)
 
 
 class AdventSunday(Sunday):
+    __slots__ = ()
+
     def title(self):
         return "Dominica %s. Adventus" % (roman(self.week_num),)
 
 
 class AdventFeria(Feria):
+    __slots__ = ()
     penitential_lauds = True
     def title(self):
         return "Dominica %s. Adventus" % (roman(self.week_num),)
 
 
-class BVMOnSaturday(Feast): pass
+class BVMOnSaturday(Feast):
+    __slots__ = ()
 
-class Vigil(Office): pass
+class Vigil(Office):
+    __slots__ = ()
 
 class SeptuagesimatideFeria(Feria):
+    __slots__ = ()
     penitential_lauds = True
 
 class SeptuagesimatideSunday(Sunday):
+    __slots__ = ()
     penitential_lauds = True
 
 class LentenFeria(Feria):
+    __slots__ = ()
     extra_keys = [
         'proprium/de-tempore/quadragesima/in-feriis',
         'proprium/de-tempore/quadragesima',
@@ -184,35 +317,50 @@ class LentenFeria(Feria):
 
 # For Ash Wednesday and the three following days.  XXX: This is a bit ugly.
 class EarlyLentenFeria(LentenFeria):
+    __slots__ = ()
     extra_keys = []
 
 class LentenSunday(Sunday):
+    __slots__ = ()
     extra_keys = [
         'proprium/de-tempore/quadragesima',
     ]
     penitential_lauds = True
 
 class PassiontideFeria(LentenFeria):
+    __slots__ = ()
     extra_keys = [
         'proprium/de-tempore/passionis/in-feriis',
         'proprium/de-tempore/passionis',
     ]
 
 class PassiontideSunday(LentenSunday):
+    __slots__ = ()
     extra_keys = [
         'proprium/de-tempore/passionis',
     ]
 
-class WithinOctave(Office): pass
-class OctaveDay(Office): pass
+class WithinOctave(Office):
+    __slots__ = ()
+
+class OctaveDay(Office):
+    __slots__ = ()
 
 class OfTheDead(Office):
+    __slots__ = ()
     hours_key = 'defunctorum'
 
 class Suffrage(Office):
+    __slots__ = ('key',)
+    key: str
+
     def __init__(self, key):
-        super().__init__({'ritus': 'simplex', 'classis': 4, 'titulus': key})
-        self.key = 'suffragia/%s' % (key,)
+        super().__init__({'ritus': 'simplex', 'classis': 4, 'titulus': key},
+                         office_id=('suffragia', key))
+        self._set_fields(key='suffragia/%s' % (key,))
+
+    def __reduce__(self):
+        return (self.__class__, (self.desc['titulus'],))
 
     @property
     def keys(self):
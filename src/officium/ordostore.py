@@ -0,0 +1,125 @@
+import glob
+import json
+import mmap
+import os
+import struct
+
+from .util import atomic_write
+
+
+class OrdoStore:
+    """A directory of compiled ordos: for each set of rubrics, calendar
+    fingerprint and year, the canonical IDs of the offices occurring on each
+    day of the year after transfer.  Files are read through a memory map.  A
+    file is only ever used with the fingerprint and format version for which
+    it was written, so any change to the calendar data, to the rules or to the
+    format causes the year to be regenerated.
+
+    Each file consists of the magic string; the length of a JSON header
+    followed by the header itself, giving the format version, the
+    fingerprint, the year and the table of distinct office IDs; the offsets
+    into the entries of the first entry for each day, with a final offset for
+    the end; and the entries themselves, each an index into the table of
+    office IDs.
+    """
+
+    MAGIC = b'officium-ordo-1\n'
+
+    # Version of the file format, to be bumped whenever the layout or the
+    # meaning of the stored IDs changes.  Files of any other version are
+    # treated as absent.
+    VERSION = 1
+
+    _header_length = struct.Struct('<I')
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, rubrics, fingerprint, year):
+        return os.path.join(self.directory, '%s-%s-%d.ordo' % (
+            rubrics, fingerprint[:16], year))
+
+    def read(self, rubrics, fingerprint, year):
+        """Returns a list containing, for each day of the year, a list of the
+        IDs of the offices occurring on that day, or None if the store holds
+        no such year.
+        """
+        try:
+            f = open(self.path(rubrics, fingerprint, year), 'rb')
+        except FileNotFoundError:
+            return None
+        # A file that is empty, truncated or otherwise corrupt is treated as
+        # absent, so that the year is regenerated and the file replaced.
+        try:
+            with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._parse(data, fingerprint, year)
+        except (ValueError, struct.error, KeyError, IndexError, TypeError):
+            return None
+
+    def _parse(self, data, fingerprint, year):
+        if data[:len(self.MAGIC)] != self.MAGIC:
+            return None
+        pos = len(self.MAGIC)
+        (header_length,) = self._header_length.unpack_from(data, pos)
+        pos += self._header_length.size
+        header = json.loads(data[pos:pos + header_length].decode())
+        pos += header_length
+        if (header['version'] != self.VERSION or
+                header['fingerprint'] != fingerprint or header['year'] != year):
+            return None
+
+        office_ids = [tuple(office_id) for office_id in header['offices']]
+        num_days = header['days']
+        offsets = struct.unpack_from('<%dI' % (num_days + 1,), data, pos)
+        pos += 4 * (num_days + 1)
+        entries = struct.unpack_from('<%dH' % (offsets[-1],), data, pos)
+        return [
+            [office_ids[i] for i in entries[offsets[day]:offsets[day + 1]]]
+            for day in range(num_days)
+        ]
+
+    def write(self, rubrics, fingerprint, year, days):
+        """Stores the IDs of the offices occurring on each day of the year, and
+        removes any files for the same year with other fingerprints.
+        """
+        office_ids = []
+        numbers = {}
+        offsets = [0]
+        entries = []
+        for day in days:
+            for office_id in day:
+                if office_id not in numbers:
+                    numbers[office_id] = len(office_ids)
+                    office_ids.append(office_id)
+                entries.append(numbers[office_id])
+            offsets.append(len(entries))
+
+        # Entries are stored in sixteen bits.
+        assert len(office_ids) <= 0x10000
+
+        header = json.dumps({
+            'fingerprint': fingerprint,
+            'year': year,
+            'days': len(days),
+            'offices': office_ids,
+            'version': self.VERSION,
+        }, sort_keys=True).encode()
+
+        os.makedirs(self.directory, exist_ok=True)
+        stale = glob.glob(os.path.join(self.directory, '%s-*-%d.ordo' % (
+            glob.escape(rubrics), year)))
+
+        path = self.path(rubrics, fingerprint, year)
+        with atomic_write(path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(self._header_length.pack(len(header)))
+            f.write(header)
+            f.write(struct.pack('<%dI' % (len(offsets),), *offsets))
+            f.write(struct.pack('<%dH' % (len(entries),), *entries))
+
+        for stale_path in stale:
+            if stale_path != path:
+                try:
+                    os.unlink(stale_path)
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,64 @@
+"""Generation of offices for long ranges of dates across several processes.
+
+Transfer resolution carries state from one day to the next, but
+CalendarResolver starts each walk from a deterministic warm-up (or from a
+transfer checkpoint), and its results don't depend on whatever was resolved
+before.  A range of dates can therefore be sharded by year, each shard
+generated in a separate process, and the results merged in date order, and
+this gives the same results as a serial walk over the whole range.
+"""
+
+import concurrent.futures
+import itertools
+
+from .calendar import Date
+
+
+# State of each worker process, as returned by the setup function.  This is
+# held in a dictionary so that it can be set without a global statement.
+_worker = {}
+
+
+def year_shards(start, end):
+    """Returns a list of (start, end) pairs splitting the inclusive range of
+    dates at year boundaries.
+    """
+    assert start <= end
+    return [
+        (max(start, Date(year, 1, 1)), min(end, Date(year, 12, 31)))
+        for year in range(start.year, end.year + 1)
+    ]
+
+
+def _init_worker(setup):
+    _worker['state'] = setup()
+
+
+def _run_shard(process_day, shard):
+    resolver, context = _worker['state']
+    return [process_day(context, date, hours)
+            for (date, hours) in resolver.offices_range(*shard)]
+
+
+def offices_range(setup, start, end, process_day, jobs=None):
+    """Generates the results of process_day(context, date, hours) for every
+    date from start to end inclusive, in date order, where hours is as
+    returned by CalendarResolver.offices().
+
+    setup() is called once in each worker process, and must return a
+    (resolver, context) pair.  The hours can't be returned from the workers
+    directly, so process_day() should reduce them to whatever the caller needs,
+    e.g. rendered text, which must be picklable.  setup and process_day must
+    themselves be picklable, so should be module-level functions or partial
+    applications thereof.  jobs is the number of worker processes, defaulting
+    to the number of processors.
+    """
+    shards = year_shards(start, end)
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(setup,),
+    ) as executor:
+        for results in executor.map(_run_shard,
+                                    itertools.repeat(process_day), shards):
+            yield from results
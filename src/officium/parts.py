@@ -6,8 +6,20 @@ import jinja2
 from officium import data
 from officium.psalmish import descriptor_to_psalmish, PsalmishWithGloria
 
+class Cycle:
+    """An iterable repeating the specified items without end.  Unlike
+    itertools.cycle, each iteration starts afresh, so that it can be shared
+    as a class attribute without state leaking between uses.
+    """
+    def __init__(self, *items):
+        self.items = items
+
+    def __iter__(self):
+        return itertools.cycle(self.items)
+
+
 class Group:
-    child_default = itertools.cycle([str])
+    child_default = Cycle(str)
     _title = None
 
     def __init__(self, contents, **meta):
@@ -59,9 +71,9 @@ class PsalmVerse(Group): pass
 class Chapter(Group): pass
 class HymnLine(Group): pass
 class HymnVerse(Group):
-    child_default = itertools.cycle([HymnLine])
+    child_default = Cycle(HymnLine)
 class Hymn(Group):
-    child_default = itertools.cycle([HymnVerse])
+    child_default = Cycle(HymnVerse)
     title = 'hymnus'
 
 def HymnWithProperDoxology(doxology):
@@ -79,7 +91,7 @@ class VersicleWithAlleluia(SingleAlleluiaMixin, Versicle): pass
 class VersicleResponse(Group): pass
 class VersicleResponseWithAlleluia(SingleAlleluiaMixin, VersicleResponse): pass
 class VersicleWithResponse(Group):
-    child_default = itertools.cycle([Versicle, VersicleResponse])
+    child_default = Cycle(Versicle, VersicleResponse)
 class VersicleWithResponseWithAlleluia(Group):
     child_default = [VersicleWithAlleluia, VersicleResponseWithAlleluia]
 class Oration(Group): pass
@@ -170,7 +182,7 @@ class StructuredLookup:
             return record_class(children, **meta)
         else:
             # We're not a Group.  Lists are not allowed.
-            if isinstance(value, list):
+            if isinstance(value, (list, tuple)):
                 raise DataValidationError("List in non-Group context %r: %r" %
                                           (record_class, raw))
             if meta:
@@ -183,7 +195,7 @@ class StructuredLookup:
         assert False, "Unreachable"
 
     def build_renderable_list(self, default_classes, raw, lang_data):
-        if not isinstance(raw, list):
+        if not isinstance(raw, (list, tuple)):
             raw = [raw]
         return [self.build_renderable(default_class, item, lang_data)
                 for (item, default_class) in zip(raw, default_classes)]
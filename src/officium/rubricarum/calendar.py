@@ -31,7 +31,7 @@ class CalendarResolver1962(CalendarResolver):
         return date.day_of_week == 0
 
     @classmethod
-    def _well_behaved_reading_date(cls, date):
+    def well_behaved_reading_date(cls, date):
         # The week of the month is defined to be the week _in_ the month, so
         # the weakly-preceding Sunday is well-behaved.
         return date - date.day_of_week
@@ -173,6 +173,12 @@ class CalendarResolver1962(CalendarResolver):
 
         assert False, "Unexpected occurrence: (%r, %r)" % (a, b)
 
+    @classmethod
+    def precedence_keys(cls, offices):
+        # Higher-ranked days always win, and occurrence_ranktie_resolution()
+        # settles the rest.
+        return [office.rank for office in offices]
+
     @classmethod
     def occurrence_resolution(cls, a, b):
         if a.rank < b.rank:
@@ -242,6 +248,18 @@ class CalendarResolver1962(CalendarResolver):
             return cls.privileged_commemoration(office, office_date)
         return list(filter(privileged, commemorations))
 
+    @staticmethod
+    def concurrence_date_key(date):
+        # The date matters only through has_first_vespers(), which cares about
+        # Sundays.
+        return date.day_of_week
+
+    @staticmethod
+    def day_plan_date_key(date):
+        # Likewise for the rest of the arrangement of the hours, where it also
+        # enters through privileged_commemoration().
+        return date.day_of_week
+
     @classmethod
     def concurrence_resolution(cls, preceding, following, date):
         # Since we have concurrence at all, the following office must be a
@@ -294,7 +312,7 @@ class CalendarResolver1962(CalendarResolver):
         assert transfer_office.rank == 1
         # The office can be transferred here if and only if it would win in
         # occurrence.
-        winner, _ = cls.occurrence_resolution(transfer_office, offices[0])
+        winner, _ = cls.resolve_occurrence_pair(transfer_office, offices[0])
         return winner == transfer_office
 
     @classmethod
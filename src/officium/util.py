@@ -1,3 +1,8 @@
+import contextlib
+import os
+import tempfile
+
+
 _units_map     = ['', 'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX']
 _tens_map      = ['', 'X', 'XX', 'XXX', 'XL', 'L', 'LX', 'LXX', 'LXXX', 'XC']
 _hundreds_map  = ['', 'C', 'CC', 'CCC', 'CD', 'D', 'DC', 'DCC', 'DCCC', 'CM']
@@ -24,3 +29,21 @@ day_ids = [
     "feria-vi",
     "sabbato",
 ]
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w', **kwargs):
+    """Opens a file for writing in place of the specified path, and renames it
+    into place when the block completes.  Readers, perhaps in other processes,
+    therefore never see a partial file, nor does an interrupted run leave one
+    behind.  Arguments besides the path are passed to open().
+    """
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -58,7 +58,7 @@ class LaudsAndVespers(ABC):
             },
         )
 
-    def lookup_order(self, office, items, use_commons=True):
+    def lookup_order(self, office, items, use_commons=True, prune=True):
         paths = []
 
         for keys in [office.keys] + ([['%s/commune' % (key,)
@@ -101,16 +101,20 @@ class LaudsAndVespers(ABC):
 
         items = list(items)
         for path in paths:
+            # Skip paths under which the index has nothing to find, which is
+            # most of them.
+            if prune and not self._index.has_subtree(path):
+                continue
             for item in items:
                 yield '/'.join([path, item])
 
     def lookup(self, office, bases, *items, **kwargs):
+        items = ['/'.join(b + [item]) for item in items for b in bases]
+        # The unpruned order is generated only if the lookup fails, so that
+        # the failure lists every candidate.
         return self._index.lookup(
-            self.lookup_order(
-                office,
-                ('/'.join(b + [item]) for item in items for b in bases),
-                **kwargs
-            )
+            self.lookup_order(office, items, **kwargs),
+            self.lookup_order(office, items, prune=False, **kwargs),
         )
 
     def lookup_main(self, *items, **kwargs):
@@ -244,9 +248,9 @@ class LaudsAndVespers(ABC):
     def resolve(self):
         # XXX: Information about the season should come with the offices for the
         # day.  Also, take care about the boundaries.
-        easter = self._calendar_resolver.easter_sunday(self._date.year)
-        alleluia = not (easter - 7 * 9 <= self._date < easter - 1)
-        eastertide = easter <= self._date < easter + 8 * 7 - 1
+        table = self._calendar_resolver.year_table(self._date.year)
+        alleluia = not (table.septuagesima <= self._date < table.easter - 1)
+        eastertide = table.easter <= self._date < table.pentecost + 6
 
         if eastertide:
             antiphon_class = parts.AntiphonWithAlleluia